@@ -0,0 +1,52 @@
+"""
+Микробенчмарк: стоимость извлечения заголовка и номера страницы на одну страницу
+через str(block) + regex (прежний способ) и через src.validator.pdf.spans.
+
+Запуск из корня репозитория:
+    python -m benchmarks.bench_pdf_span_access [file.pdf] [repeat]
+"""
+import re
+import sys
+import timeit
+
+import pymupdf
+
+from src.validator.pdf.layout import DocumentLayout
+from src.validator.pdf.spans import first_line_text, page_number_candidate
+
+
+def _legacy_header(block) -> str:
+    m = re.search(r"'text'\s*:\s*'([^']+)'", str(block))
+    return m.group(1).strip() if m else ""
+
+
+def _legacy_number(block) -> int:
+    for m in re.finditer(r"'text'\s*:\s*'([^']+)'", str(block)):
+        val = m.group(1).strip()
+        if re.fullmatch(r'[+-]?\d+', val):
+            return int(val)
+    return 0
+
+
+def _run(pages, header, number):
+    for page in pages:
+        for block in page.text_blocks():
+            header(block)
+            number(block)
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else "latex_test/test_1.pdf"
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    pages = list(DocumentLayout(pymupdf.open(path)))
+    for name, header, number in (
+        ("str(block) + regex", _legacy_header, _legacy_number),
+        ("spans accessors", first_line_text, page_number_candidate),
+    ):
+        total = timeit.timeit(lambda: _run(pages, header, number), number=repeat)
+        print(f"{name:<20} {total / repeat / len(pages) * 1e6:10.1f} us/page")
+
+
+if __name__ == "__main__":
+    main()
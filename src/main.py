@@ -3,24 +3,20 @@ import os
 from src.validator.docx.start_checks import start_check_docx_file
 from src.validator.pdf.open_doc import open_pdf, validate_pdf
 from src.validator.result import ValidationResult
-from src.validator.tex.parser import parse_latex_structure
-from src.validator.tex.traverse_nodes import traverse_nodes
+from src.validator.tex.traverse_nodes import validate_latex
 
 
 def run_validate_latex(filepath):
-    with open(filepath, encoding='utf-8') as f:
-        latex_content = f.read()
-        structure = parse_latex_structure(latex_content)
-        result = traverse_nodes(structure)
-        print(f"    Проверка latex:")
-        if len(result.warnings.keys()) == 0:
-            print("         Предупреждений нет!")
-        else:
-            print("         Предупреждения:", result.warnings.keys())
-        if len(result.warnings.keys()) == 0:
-            print("         Ошибок нет!")
-        else:
-            print("         Ошибки:", result.errors.keys())
+    result = validate_latex(filepath)
+    print(f"    Проверка latex:")
+    if len(result.warnings.keys()) == 0:
+        print("         Предупреждений нет!")
+    else:
+        print("         Предупреждения:", result.warnings.keys())
+    if len(result.warnings.keys()) == 0:
+        print("         Ошибок нет!")
+    else:
+        print("         Ошибки:", result.errors.keys())
 
 
 def run_validate_pdf(filepath):
@@ -92,6 +92,13 @@ def format_single(result: ValidationResult, *, source: str | None = None) -> str
     else:
         lines.append(_green("ℹ  Warnings not found."))
 
+    # notes (e.g. partial page coverage)
+    if result.log:
+        lines.append("")
+        lines.append("ℹ  Notes:")
+        for note in result.log:
+            lines.append(f"   • {note}")
+
     return "\n".join(lines)
 
 
@@ -0,0 +1,21 @@
+from src.validator.docx.start_checks import start_check_docx_file
+from src.validator.pdf.open_doc import open_pdf, validate_pdf
+from src.validator.result import ValidationResult
+from src.validator.source import Source
+from src.validator.tex.traverse_nodes import validate_latex
+
+
+def validate_document(source: Source, filetype: str) -> ValidationResult:
+    """
+    Проверяет документ без записи на диск: source - путь, bytes, memoryview, mmap
+    или бинарный поток, filetype - "pdf", "docx" или "tex" (допускается с точкой).
+    """
+    filetype = filetype.lower().lstrip(".")
+    if filetype == "pdf":
+        with open_pdf(source) as doc:
+            return validate_pdf(doc)
+    if filetype == "docx":
+        return start_check_docx_file(source)
+    if filetype == "tex":
+        return validate_latex(source)
+    raise ValueError(f"неподдерживаемый формат: {filetype}")
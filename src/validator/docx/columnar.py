@@ -0,0 +1,255 @@
+from typing import Any, Dict
+
+import docx
+import numpy as np
+from docx.enum.text import WD_ALIGN_PARAGRAPH as WDAP
+from docx.oxml.ns import qn
+from docx.shared import Length
+
+from src.validator.docx.format_checker import empty_report, is_tnr
+from src.validator.docx.styles import StyleTable
+from src.validator.result import ValidationResult, ErrCause
+
+# Допустимые значения, как в format_checker.check_formatting
+SIZE_RANGE = (12.01, 14.01)
+ALLOWED_ALIGNMENTS = (WDAP.JUSTIFY, WDAP.CENTER)
+LINE_SPACING = 1.5
+LINE_SPACING_TOLERANCE = 0.1
+LEFT_MARGIN_MM = (29.5, 30.5)
+_EMU_PER_MM = 36000
+_EMU_PER_HALF_POINT = 6350
+_W_P, _W_PPR, _W_PSTYLE, _W_R, _W_RPR, _W_T = qn("w:p"), qn("w:pPr"), qn("w:pStyle"), qn("w:r"), qn("w:rPr"), qn("w:t")
+_W_RFONTS, _W_ASCII, _W_VAL = qn("w:rFonts"), qn("w:ascii"), qn("w:val")
+_EMPTY_RUN = (-1, -1, 0, -1)
+
+
+class FormattingTable:
+    """
+    Колоночное представление форматирования .docx: одна строка массива на run и на абзац
+    основного текста (как doc.paragraphs и para.runs). Итоговые свойства берутся из StyleTable
+    прямо по XML, без объектов python-docx на каждый run; правила check_formatting
+    вычисляются над таблицей масками NumPy.
+
+    Run: font (итоговый шрифт, индекс в fonts, -1 - не задан), direct_font (шрифт из
+    прямого форматирования, -1 - нет), size (полупункты, 0 - не задан), color (0xRRGGBB,
+    -1 - не задан или auto), para (индекс абзаца), text_len (длина текста без пробелов по краям).
+    Абзацы: alignment (значение WD_ALIGN_PARAGRAPH, -1 - не задано), line_spacing (множитель
+    или EMU точного интервала, NaN - не задан), line_exact (интервал задан длиной),
+    first_line_indent (EMU, NaN - не задан), heading (стиль заголовка), text_len.
+    Секции: left_margin (EMU, NaN - не задано).
+    """
+
+    def __init__(self, doc: docx.Document):
+        styles = StyleTable.from_document(doc)
+        body = doc.element.body
+        fonts: dict[str, int] = {}
+        rows: dict[tuple, tuple[int, int, int, int]] = {}
+        font, direct_font, size, color, para, text_len = [], [], [], [], [], []
+        alignment, line_spacing, line_exact, first_line_indent, heading, para_text_len = [], [], [], [], [], []
+
+        for p in body.iterchildren(_W_P):
+            index = len(alignment)
+            pPr = p.find(_W_PPR)
+            p_style = None
+            if pPr is not None:
+                p_style_elm = pPr.find(_W_PSTYLE)
+                p_style = None if p_style_elm is None else p_style_elm.get(_W_VAL)
+            for r in p.iterchildren(_W_R):
+                length = len("".join(t.text or "" for t in r.iter(_W_T)).strip())
+                para.append(index)
+                text_len.append(length)
+                if not length:
+                    # Пустые run правила не проверяют, их свойства не вычисляются
+                    row = _EMPTY_RUN
+                else:
+                    rPr = r.find(_W_RPR)
+                    # Одинаковое прямое форматирование в абзацах одного стиля разбирается один раз
+                    key = (p_style, None if rPr is None else tuple((c.tag, tuple(sorted(c.attrib.items()))) for c in rPr))
+                    row = rows.get(key)
+                    if row is None:
+                        row = rows[key] = self._run_row(styles, p_style, rPr, fonts)
+                font.append(row[0])
+                direct_font.append(row[1])
+                size.append(row[2])
+                color.append(row[3])
+
+            style = styles.effective_paragraph(pPr)
+            spacing = style.line_spacing
+            alignment.append(-1 if style.alignment is None else int(style.alignment))
+            line_spacing.append(np.nan if spacing is None else float(spacing))
+            line_exact.append(isinstance(spacing, Length))
+            first_line_indent.append(np.nan if style.first_line_indent is None else float(style.first_line_indent))
+            heading.append(styles.is_heading(p_style))
+            para_text_len.append(len("".join(t.text or "" for t in p.iter(_W_T)).strip()))
+
+        self.fonts = list(fonts)
+        self.font = np.array(font, dtype=np.int32)
+        self.direct_font = np.array(direct_font, dtype=np.int32)
+        self.size = np.array(size, dtype=np.int32)
+        self.color = np.array(color, dtype=np.int32)
+        self.para = np.array(para, dtype=np.int32)
+        self.text_len = np.array(text_len, dtype=np.int32)
+
+        self.alignment = np.array(alignment, dtype=np.int32)
+        self.line_spacing = np.array(line_spacing, dtype=np.float64)
+        self.line_exact = np.array(line_exact, dtype=bool)
+        self.first_line_indent = np.array(first_line_indent, dtype=np.float64)
+        self.heading = np.array(heading, dtype=bool)
+        self.para_text_len = np.array(para_text_len, dtype=np.int32)
+
+        self.left_margin = np.array([np.nan if s.left_margin is None else float(s.left_margin)
+                                     for s in body.xpath("./w:p/w:pPr/w:sectPr | ./w:sectPr")], dtype=np.float64)
+
+    @staticmethod
+    def _run_row(styles: StyleTable, p_style: str | None, rPr, fonts: dict[str, int]) -> tuple[int, int, int, int]:
+        """Значения колонок font, direct_font, size, color для run с прямым форматированием rPr."""
+        style = styles.effective_run(p_style, rPr)
+        rFonts = rPr.find(_W_RFONTS) if rPr is not None else None
+        direct = None if rFonts is None else rFonts.get(_W_ASCII)
+        color = style.color
+        return (-1 if style.font is None else fonts.setdefault(style.font, len(fonts)),
+                -1 if direct is None else fonts.setdefault(direct, len(fonts)),
+                round(style.size / _EMU_PER_HALF_POINT) if style.size else 0,
+                -1 if color is None else (color[0] << 16) | (color[1] << 8) | color[2])
+
+    def __len__(self) -> int:
+        return len(self.font)
+
+    @property
+    def paragraphs(self) -> int:
+        return len(self.alignment)
+
+    def tnr_fonts(self) -> np.ndarray:
+        """Маска шрифтов Times New Roman: одна проверка на уникальный шрифт, а не на run."""
+        return np.array([is_tnr(name) for name in self.fonts], dtype=bool)
+
+
+def _lookup(mask: np.ndarray, fonts: np.ndarray) -> np.ndarray:
+    # -1 (шрифт не задан) попадает на добавленный в конец False
+    return np.append(mask, False)[fonts]
+
+
+def _text_runs(t: FormattingTable) -> np.ndarray:
+    return t.text_len > 0
+
+
+def _body_runs(t: FormattingTable) -> np.ndarray:
+    """Run с текстом вне заголовков: только у них проверяются размер и цвет."""
+    return _text_runs(t) & ~t.heading[t.para]
+
+
+def wrong_font_name(t: FormattingTable) -> np.ndarray:
+    """Run с прямо заданным шрифтом, в имени которого нет «Times New Roman»."""
+    foreign = np.array(["Times New Roman" not in name for name in t.fonts], dtype=bool)
+    return _text_runs(t) & _lookup(foreign, t.direct_font)
+
+
+def not_tnr(t: FormattingTable) -> np.ndarray:
+    """Run, итоговый шрифт которого задан и не Times New Roman (doc_contains_only_tnr)."""
+    return _text_runs(t) & _lookup(~t.tnr_fonts(), t.font)
+
+
+def wrong_size(t: FormattingTable) -> np.ndarray:
+    low, high = SIZE_RANGE
+    points = t.size / 2
+    return _body_runs(t) & (t.size > 0) & ~((points >= low) & (points <= high))
+
+
+def wrong_color(t: FormattingTable) -> np.ndarray:
+    return _body_runs(t) & (t.color >= 0) & (t.color != 0)
+
+
+def wrong_alignment(t: FormattingTable) -> np.ndarray:
+    allowed = np.isin(t.alignment, [int(a) for a in ALLOWED_ALIGNMENTS])
+    return (t.para_text_len > 0) & (t.alignment >= 0) & ~allowed
+
+
+def wrong_line_spacing(t: FormattingTable) -> np.ndarray:
+    spacing = t.line_spacing
+    with np.errstate(invalid="ignore"):
+        off = np.abs(spacing - LINE_SPACING) > LINE_SPACING_TOLERANCE
+    return (t.para_text_len > 0) & ~np.isnan(spacing) & (spacing != 0) & off
+
+
+def wrong_left_margin(t: FormattingTable) -> bool:
+    """Левое поле первой секции вне 29.5–30.5 мм."""
+    low, high = LEFT_MARGIN_MM
+    margin = t.left_margin[0] / _EMU_PER_MM
+    return not (low <= margin <= high)
+
+
+def _last(mask: np.ndarray) -> int | None:
+    if not mask.any():
+        return None
+    return len(mask) - 1 - int(mask[::-1].argmax())
+
+
+def offending_paragraphs(t: FormattingTable, limit: int = 10) -> list[int]:
+    """Индексы первых limit абзацев, в которых нарушено хотя бы одно правило."""
+    runs = wrong_font_name(t) | not_tnr(t) | wrong_size(t) | wrong_color(t)
+    offending = np.zeros(t.paragraphs, dtype=bool)
+    offending[t.para[runs]] = True
+    offending |= wrong_alignment(t) | wrong_line_spacing(t)
+    return [int(i) for i in np.flatnonzero(offending)[:limit]]
+
+
+def document_statistics(t: FormattingTable) -> Dict[str, Any]:
+    """
+    Сводка по документу: доля символов по итоговым шрифтам и размерам (pt), доля абзацев
+    с нужным выравниванием и интервалом, средний абзацный отступ (мм).
+    """
+    text = _text_runs(t)
+    chars = int(t.text_len[text].sum())
+    fonts = np.bincount(t.font[text] + 1, weights=t.text_len[text], minlength=len(t.fonts) + 1)
+    sizes, size_index = np.unique(t.size[text], return_inverse=True)
+    size_chars = np.bincount(size_index, weights=t.text_len[text], minlength=len(sizes))
+    paragraphs = t.para_text_len > 0
+    counted = max(int(paragraphs.sum()), 1)
+    indent = t.first_line_indent[paragraphs & ~np.isnan(t.first_line_indent)]
+    return {
+        "runs": len(t),
+        "paragraphs": t.paragraphs,
+        "chars": chars,
+        "fonts": {name: float(fonts[i + 1]) / max(chars, 1) for i, name in enumerate(t.fonts) if fonts[i + 1]},
+        "sizes": {float(hp) / 2 if hp else None: float(n) / max(chars, 1) for hp, n in zip(sizes, size_chars)},
+        "alignment_ok": float((paragraphs & ~wrong_alignment(t)).sum()) / counted,
+        "line_spacing_ok": float((paragraphs & ~wrong_line_spacing(t)).sum()) / counted,
+        "mean_first_line_indent_mm": float(indent.mean()) / _EMU_PER_MM if len(indent) else None,
+    }
+
+
+def validate_columnar(t: FormattingTable, r: ValidationResult) -> Dict[str, Any]:
+    """
+    Правила check_formatting над колоночной таблицей. Ошибки и отчёт совпадают
+    с check_formatting: как и при обходе документа, для каждой причины остаётся
+    сообщение последнего нарушения.
+    """
+    results = empty_report()
+    if wrong_left_margin(t):
+        r.add_err(ErrCause.INVALID_PAGE_FIELDS, "left margin must be between 29.5 and 30.5")
+        results["page_margins_check"] = False
+
+    i = _last(wrong_font_name(t))
+    if i is not None:
+        r.add_err(ErrCause.INVALID_FONT, "wrong font name: " + t.fonts[t.direct_font[i]])
+        results["font_check"] = False
+    i = _last(wrong_size(t))
+    if i is not None:
+        r.add_err(ErrCause.INVALID_FONT_SIZE, "wrong font size: " + str(int(t.size[i]) * _EMU_PER_HALF_POINT))
+        results["font_size_check"] = False
+    i = _last(wrong_color(t))
+    if i is not None:
+        r.add_err(ErrCause.INVALID_FONT_COLOR, f"wrong color rgb: {t.color[i]:06X}")
+        results["color_check"] = False
+    i = _last(wrong_alignment(t))
+    if i is not None:
+        r.add_err(ErrCause.INVALID_TEXT_ALIGNMENT, WDAP(int(t.alignment[i])))
+        results["alignment_check"] = False
+    i = _last(wrong_line_spacing(t))
+    if i is not None:
+        spacing = t.line_spacing[i]
+        r.add_err(ErrCause.INVALID_LINE_SPACING, Length(int(spacing)) if t.line_exact[i] else float(spacing))
+        results["line_spacing_check"] = False
+    if not_tnr(t).any():
+        r.add_err(ErrCause.INVALID_FONT, "incorrect font")
+    return results
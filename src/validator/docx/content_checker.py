@@ -1,8 +1,10 @@
 import re
-from typing import Dict, List, Set
+from typing import Dict, List
 import docx
 from docx.enum.style import WD_STYLE_TYPE
 
+from src.validator.heading_match import match_headings
+
 STOP_WORDS = {"ЗАКЛЮЧЕНИЕ", "ПРИЛОЖЕНИЕ", "СПИСОК", "ВВЕДЕНИЕ"}
 
 def _clean(line: str) -> str:
@@ -38,12 +40,6 @@ def extract_toc_headings(doc: docx.Document) -> List[str]:
             break
 
     return toc_headings
-def _clean(line: str) -> str:
-    return re.sub(r"\.{2,}\s*\d+\s*$", "", line).strip()
-
-def _norm(s: str) -> str:
-    return re.sub(r"\s+", " ", s.casefold()).strip()
-
 def extract_and_check_headings_from_docx(doc :docx.Document()) -> Dict:
 
     toc = extract_toc_headings(doc)
@@ -52,18 +48,20 @@ def extract_and_check_headings_from_docx(doc :docx.Document()) -> Dict:
                 "reason": "Оглавление (TOC) не найдено",
                 "missing_headings": []}
 
-    # собираем реальные заголовки по стилям Heading
-    real: Set[str] = set()
-    for p in doc.paragraphs:
-        if p.style and p.style.name.startswith(("Heading", "Заголовок")):
-            real.add(_norm(p.text))
+    # собираем реальные заголовки по стилям Heading в порядке следования
+    real: List[str] = [p.text for p in doc.paragraphs
+                       if p.style and p.style.name.startswith(("Heading", "Заголовок"))]
 
-    missing = [h for h in toc if _norm(h) not in real]
+    match = match_headings(toc, real)
 
-    if missing:
+    if match.missing:
         return {"status": "failed",
                 "reason": "Некоторые заголовки из содержания не найдены.",
-                "missing_headings": missing}
+                "missing_headings": match.missing}
+    if match.out_of_order:
+        return {"status": "failed",
+                "reason": "Заголовки идут не в том порядке, что в содержании.",
+                "missing_headings": [],
+                "out_of_order_headings": match.out_of_order}
     return {"status": "passed",
             "message": "Все заголовки из содержания присутствуют."}
-
@@ -1,79 +1,133 @@
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, NamedTuple
 from docx.shared import RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH as WDAP
 import docx
 import re
 
+from src.validator.docx.styles import StyleTable, has_text
 from src.validator.result import ValidationResult, ErrCause
 
+_TNR = re.compile(r'times\s*new\s*roman', re.IGNORECASE)
 
-def get_effective_fontname(doc: docx.Document, para: docx.text.paragraph.Paragraph, run: docx.text.run.Run) -> str:
-    # 1. Если в самом run.font явно указан шрифт
-    if run.font and run.font.name:
-        return run.font.name
 
-    # 2. Если у run есть стиль (run.style) и там прописан шрифт
-    if run.style and run.style.font and run.style.font.name:
-        return run.style.font.name
+def is_tnr(font_name: str) -> bool:
+    # Учитываем возможные вариации ("Times New Roman CE", "Times New Roman Bold" и т.п.)
+    return _TNR.search(font_name) is not None
 
-    # 3. Смотрим стиль абзаца
-    para_style = para.style
-    if para_style and para_style.font and para_style.font.name:
-        return para_style.font.name
 
-    # 4. Поднимаемся по base_style
-    style_candidate = para_style
-    while style_candidate and style_candidate.base_style:
-        base = style_candidate.base_style
-        if base.font and base.font.name:
-            return base.font.name
-        style_candidate = base
-
-    # 5. Проверяем стиль 'Normal' (часто основной)
-    if 'Normal' in doc.styles:
-        normal_style = doc.styles['Normal']
-        if normal_style and normal_style.font and normal_style.font.name:
-            return normal_style.font.name
-
-    return None
+def get_effective_fontname(doc: docx.Document, para: docx.text.paragraph.Paragraph, run: docx.text.run.Run,
+                           table: StyleTable | None = None) -> str:
+    """
+    Итоговое имя шрифта run: прямое форматирование поверх таблицы стилей
+    (символьный стиль, стиль абзаца с base_style, docDefaults). None - шрифт нигде не указан.
+    """
+    table = table or StyleTable.from_document(doc)
+    return table.effective_run(para._p.style, run._r.rPr).font
 
 
-def doc_contains_only_tnr(doc: docx.Document()) -> bool:
+def doc_contains_only_tnr(doc: docx.Document(), table: StyleTable | None = None) -> bool:
+    table = table or StyleTable.from_document(doc)
     for para in doc.paragraphs:
+        p_style = para._p.style
         for run in para.runs:
-            eff_font = get_effective_fontname(doc, para, run)
+            if not has_text(run._r):
+                continue
+            eff_font = table.effective_run(p_style, run._r.rPr).font
             if eff_font is None:
                 # Если вы хотите допустить, что None = Times New Roman, закомментируйте эту строку:
                 continue
 
-            # Здесь проверяем, что строка eff_font действительно содержит "Times New Roman"
-            # с учётом возможных вариаций ("Times New Roman CE", "Times New Roman Bold" и т.п.).
-            if not re.search(r'times\s*new\s*roman', eff_font, re.IGNORECASE):
+            if not is_tnr(eff_font):
                 return False
     return True
 
 
-def check_formatting(doc: docx.Document, result: ValidationResult) -> Dict[str, Any]:
-    """
-    Проверка форматирования (Times New Roman, размер шрифта 12–14, чёрный цвет и т. п.)
-    в .docx-файле. Для .doc нужно сначала конвертировать в docx.
+class ParagraphFindings(NamedTuple):
+    """Нарушения одного абзаца: последнее сообщение каждой причины и признак «только Times New Roman»."""
+    errors: dict[ErrCause, Any]
+    only_tnr: bool
+
+
+# Флаг отчёта check_formatting, который снимает нарушение в абзаце
+_RESULT_FLAGS = {
+    ErrCause.INVALID_FONT: "font_check",
+    ErrCause.INVALID_FONT_SIZE: "font_size_check",
+    ErrCause.INVALID_FONT_COLOR: "color_check",
+    ErrCause.INVALID_TEXT_ALIGNMENT: "alignment_check",
+    ErrCause.INVALID_LINE_SPACING: "line_spacing_check",
+}
+BLACK = RGBColor(0x00, 0x00, 0x00)
+
+
+class FormattingRules(NamedTuple):
+    """Допустимые значения проверок check_paragraph: размер шрифта (pt, включительно) и выравнивания."""
+    font_size_pt: tuple[float, float] = (12.01, 14.01)
+    alignments: tuple[WDAP, ...] = (WDAP.JUSTIFY, WDAP.CENTER)
 
-    Ограничения:
-     - python-docx не всегда возвращает точное название шрифта (может не передаваться)
-     - Межстрочный интервал, выравнивание, поля страницы также читаются ограниченно.
 
-    Пример наброска: смотрим каждый параграф,
-    у каждого run проверяем font.name, font.size, font.color
+DEFAULT_RULES = FormattingRules()
+
+
+def check_paragraph(para: docx.text.paragraph.Paragraph, table: StyleTable,
+                    rules: FormattingRules = DEFAULT_RULES) -> ParagraphFindings:
     """
-    results = {
-        "font_check": True,
-        "font_size_check": True,
-        "color_check": True,
-        "line_spacing_check": True,  # в python-docx проверка немного сложнее
-        "alignment_check": True,  # то же самое
-        "page_margins_check": True,  # margins в docx можно смотреть через section
-    }
-    BLACK = RGBColor(0x00, 0x00, 0x00)
+    Проверяет один абзац независимо от остальных. Результат зависит только от XML абзаца
+    и итоговых свойств его стилей в table, поэтому его можно кэшировать (см. paragraph_cache).
+    """
+    errors: dict[ErrCause, Any] = {}
+    only_tnr = True
+    p_style = para._p.style
+    # Размер и цвет заголовков задаются отдельно от основного текста
+    heading = table.is_heading(p_style)
+    for run in para.runs:
+        if not has_text(run._r):
+            continue
+        font = run.font
+        # Пример проверки шрифта:
+        # 1) font.name может быть None (если он наследуется от стиля),
+        #    унаследованный шрифт проверяет doc_contains_only_tnr
+        # 2) В реальности проверять + "Times New Roman CYR" и другие вариации
+        if font.name and "Times New Roman" not in font.name:
+            errors[ErrCause.INVALID_FONT] = "wrong font name: " + str(font.name)
+
+        style = table.effective_run(p_style, run._r.rPr)
+        if style.font is not None and not is_tnr(style.font):
+            only_tnr = False
+
+        # Размер (Length, в поинтах - .pt) с учётом стилей; None, если нигде не задан
+        if style.size and not heading:
+            font_size_pt = style.size.pt
+            low, high = rules.font_size_pt
+            if not (low <= font_size_pt <= high):
+                errors[ErrCause.INVALID_FONT_SIZE] = "wrong font size: " + str(style.size)
+
+        # Цвет: None, если не задан или "auto"
+        if style.color and not heading:
+            # Проверяем, что это действительно чёрный (#000000)
+            if style.color != BLACK:
+                errors[ErrCause.INVALID_FONT_COLOR] = "wrong color rgb: " + str(style.color)
+
+    if not has_text(para._p):
+        return ParagraphFindings(errors, only_tnr)
+    para_style = table.effective_paragraph(para._p.pPr)
+    # Проверка выравнивания параграфа
+    # Значения: WD_ALIGN_PARAGRAPH.LEFT, CENTER, RIGHT, JUSTIFY
+    if para_style.alignment is not None:
+        if para_style.alignment not in rules.alignments:
+            errors[ErrCause.INVALID_TEXT_ALIGNMENT] = para_style.alignment
+
+    # Межстрочный интервал: множитель строк (float) или точная высота (Length)
+    line_spacing = para_style.line_spacing
+    if line_spacing:
+        # Обычно 1.5 = 1.5. Если это значение не совпадает,
+        # считаем, что нет нужного интервала
+        # (проверка строго по вашему критерию)
+        if abs(line_spacing - 1.5) > 0.1:
+            errors[ErrCause.INVALID_LINE_SPACING] = line_spacing
+    return ParagraphFindings(errors, only_tnr)
+
+
+def check_margins(doc: docx.Document, result: ValidationResult, results: Dict[str, Any]):
     # Пример: проверка первого секционного размета на поля
     section = doc.sections[0]
     # Ширина левого поля (section.left_margin) хранится в EMU (English Metric Units)
@@ -86,60 +140,59 @@ def check_formatting(doc: docx.Document, result: ValidationResult) -> Dict[str,
         result.add_err(ErrCause.INVALID_PAGE_FIELDS, "left margin must be between 29.5 and 30.5")
         results["page_margins_check"] = False
 
-    # Перебираем параграфы и их 'run'
-    for para in doc.paragraphs:
-        for run in para.runs:
-            font = run.font
-            # Пример проверки шрифта:
-            # 1) font.name может быть None (если он наследуется от стиля),
-            #    тогда надо смотреть стиль параграфа и т.д.
-            # 2) В реальности проверять + "Times New Roman CYR" и другие вариации
-            if font.name and "Times New Roman" not in font.name:
-                result.add_err(ErrCause.INVALID_FONT, "wrong font name: " + str(font.name))
-                results["font_check"] = False
-
-            # Пример проверки размера (font.size в pt)
-            # font.size — объект типа Pt или None, если нет прямого указания
-            if font.size:
-                # font.size is in English Metric Units (points = 1/72 inch)
-                font_size_pt = font.size.pt
-                if not (12.01 <= font_size_pt <= 14.01):
-                    result.add_err(ErrCause.INVALID_FONT_SIZE, "wrong font size: " + str(font.size))
-                    results["font_size_check"] = False
-
-            # Пример проверки цвета (font.color.rgb)
-            # Если цвет не указан, font.color может быть None
-            # или <Element ...> без поля rgb
-            if font.color and font.color.rgb:
-                # Проверяем, что это действительно чёрный (#000000)
-                if font.color.rgb != BLACK:
-                    result.add_err(ErrCause.INVALID_FONT_COLOR, "wrong color rgb: " + str(font.color.rgb))
-                    results["color_check"] = False
-
-        # Проверка выравнивания параграфа (para.alignment)
-        # Значения: WD_ALIGN_PARAGRAPH.LEFT, CENTER, RIGHT, JUSTIFY
-        if para.alignment is not None:
-            # Для выравнивания по ширине — JUSTIFY
-            # (значение обычно = 3)
-            # нужно from docx.enum.text import WD_ALIGN_PARAGRAPH
-            if para.alignment not in (WDAP.JUSTIFY, WDAP.CENTER):
-                result.add_err(ErrCause.INVALID_TEXT_ALIGNMENT, para.alignment)
-                results["alignment_check"] = False
-
-        # Межстрочный интервал (line_spacing)
-        # python-docx позволяет смотреть para.paragraph_format.line_spacing
-        # Но часто бывает None, если не задали явно
-        # (наследуется из общей стилевой настройки).
-        line_spacing = para.paragraph_format.line_spacing
-        if line_spacing:
-            # Обычно 1.5 = 1.5. Если это значение не совпадает,
-            # считаем, что нет нужного интервала
-            # (проверка строго по вашему критерию)
-            if abs(line_spacing - 1.5) > 0.1:
-                result.add_err(ErrCause.INVALID_LINE_SPACING, line_spacing)
-                results["line_spacing_check"] = False
-    if not(doc_contains_only_tnr(doc)):
+
+def merge_findings(findings: Iterable[ParagraphFindings], result: ValidationResult, results: Dict[str, Any]):
+    """
+    Собирает нарушения абзацев в порядке документа: как и при сплошной проверке,
+    для каждой причины остаётся сообщение последнего нарушения.
+    """
+    only_tnr = True
+    for paragraph in findings:
+        for cause, description in paragraph.errors.items():
+            result.add_err(cause, description)
+            results[_RESULT_FLAGS[cause]] = False
+        only_tnr = only_tnr and paragraph.only_tnr
+    if not only_tnr:
         result.add_err(ErrCause.INVALID_FONT, "incorrect font")
-    return results
 
 
+def empty_report() -> Dict[str, Any]:
+    return {
+        "font_check": True,
+        "font_size_check": True,
+        "color_check": True,
+        "line_spacing_check": True,  # в python-docx проверка немного сложнее
+        "alignment_check": True,  # то же самое
+        "page_margins_check": True,  # margins в docx можно смотреть через section
+    }
+
+
+def check_formatting(doc: docx.Document, result: ValidationResult,
+                     paragraphs: List[str] | None = None, rules: FormattingRules = DEFAULT_RULES) -> Dict[str, Any]:
+    """
+    Проверка форматирования (Times New Roman, размер шрифта 12–14, чёрный цвет и т. п.)
+    в .docx-файле. Для .doc нужно сначала конвертировать в docx.
+
+    Размер, цвет, выравнивание и межстрочный интервал берутся итоговые: прямое
+    форматирование поверх таблицы стилей (StyleTable), поэтому унаследованные
+    от стилей значения тоже проверяются. Пустые run и абзацы не проверяются,
+    размер и цвет абзацев со стилем заголовка (StyleTable.is_heading) - тоже.
+
+    Документ обходится один раз: в том же проходе проверяется, что все run набраны
+    Times New Roman (как doc_contains_only_tnr), а если передан список paragraphs,
+    в него собирается текст абзацев для проверок содержания. rules задаёт допустимые
+    размер шрифта и выравнивание.
+    """
+    results = empty_report()
+    check_margins(doc, result, results)
+
+    # Итоговые свойства стилей вычисляются один раз на документ
+    table = StyleTable.from_document(doc)
+    findings = []
+    # Перебираем параграфы и их 'run'
+    for para in doc.paragraphs:
+        if paragraphs is not None:
+            paragraphs.append(para.text)
+        findings.append(check_paragraph(para, table, rules))
+    merge_findings(findings, result, results)
+    return results
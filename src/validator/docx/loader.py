@@ -0,0 +1,88 @@
+import docx
+from docx.document import Document
+from docx.opc.constants import CONTENT_TYPE as CT
+from docx.opc.package import Unmarshaller
+from docx.opc.packuri import PACKAGE_URI
+from docx.opc.part import Part, PartFactory
+from docx.opc.phys_pkg import PhysPkgReader
+from docx.package import Package
+
+from src.validator.source import Source, as_file
+
+# Части, которые читают проверки; остальные (изображения, внедрённые объекты, темы,
+# сноски и т.д.) не распаковываются и не разбираются
+LOADED_PARTS = frozenset({
+    CT.WML_DOCUMENT_MAIN,
+    CT.WML_STYLES,
+    CT.WML_SETTINGS,
+    CT.WML_HEADER,
+    CT.WML_FOOTER,
+    CT.WML_NUMBERING,
+})
+# Выборочное чтение опирается на внутренний API python-docx (PackageReader._srels_for и т.д.).
+# Если он изменился, документ открывается обычным docx.Document целиком
+_INTERNAL_API_ERRORS = (ImportError, AttributeError, TypeError)
+
+
+class _SelectiveReader:
+    """Обёртка над читателем архива: отдаёт только части из LOADED_PARTS и служебные файлы (.rels)."""
+
+    def __init__(self, reader, content_types):
+        self._reader = reader
+        self._content_types = content_types
+
+    def blob_for(self, pack_uri):
+        if not pack_uri.endswith(".rels") and self._content_types[pack_uri] not in LOADED_PARTS:
+            return b""
+        return self._reader.blob_for(pack_uri)
+
+    def __getattr__(self, name):
+        return getattr(self._reader, name)
+
+
+def _part_factory(partname, content_type, reltype, blob, package):
+    if content_type in LOADED_PARTS:
+        return PartFactory(partname, content_type, reltype, blob, package)
+    # Пропущенная часть: связи сохраняются, содержимое пустое
+    return Part(partname, content_type, blob, package)
+
+
+def _read_package(pkg_file):
+    from docx.opc.pkgreader import PackageReader, _ContentTypeMap
+
+    phys_reader = PhysPkgReader(pkg_file)
+    try:
+        content_types = _ContentTypeMap.from_xml(phys_reader.content_types_xml)
+        reader = _SelectiveReader(phys_reader, content_types)
+        pkg_srels = PackageReader._srels_for(reader, PACKAGE_URI)
+        sparts = PackageReader._load_serialized_parts(reader, pkg_srels, content_types)
+    finally:
+        phys_reader.close()
+    return PackageReader(content_types, pkg_srels, sparts)
+
+
+def _load_selective(pkg_file) -> Package:
+    package = Package()
+    Unmarshaller.unmarshal(_read_package(pkg_file), package, _part_factory)
+    return package
+
+
+def load_docx(source: Source) -> Document:
+    """
+    Открывает .docx как docx.Document, но разбирает только document.xml, styles.xml,
+    settings.xml, колонтитулы и numbering.xml. Время и память зависят от объёма текста,
+    а не от вложенных изображений. Остальные части доступны только как пустые Part,
+    поэтому такой документ нельзя сохранять и нельзя читать из него картинки.
+    Если внутренний API python-docx несовместим, документ открывается docx.Document целиком.
+    """
+    pkg_file = as_file(source)
+    try:
+        package = _load_selective(pkg_file)
+    except _INTERNAL_API_ERRORS:
+        if hasattr(pkg_file, "seek"):
+            pkg_file.seek(0)
+        return docx.Document(pkg_file)
+    document_part = package.main_document_part
+    if document_part.content_type != CT.WML_DOCUMENT_MAIN:
+        raise ValueError(f"not a Word file, content type is '{document_part.content_type}'")
+    return document_part.document
@@ -1,36 +1,61 @@
-import docx
-from typing import Dict, List
-from docx.oxml.text.run import CT_R
-from docx.oxml.ns import qn
+from typing import Iterable, Iterator
 
-from docx import Document
-from docx.oxml.ns import qn
+import docx
+from docx.oxml.ns import nsmap
+from docx.section import Section
+from lxml import etree
 
 from src.validator.result import ValidationResult, ErrCause
 
+# Код поля начинается с PAGE (регистр не важен): « PAGE », «page \* MERGEFORMAT»;
+# NUMPAGES и SECTIONPAGES не подходят
+_IS_PAGE = "starts-with(concat(translate(normalize-space({}), 'page', 'PAGE'), ' '), 'PAGE ')"
+_HAS_PAGE_FIELD = etree.XPath(
+    f"boolean(.//w:fldSimple[{_IS_PAGE.format('@w:instr')}] | .//w:instrText[{_IS_PAGE.format('.')}])",
+    namespaces={"w": nsmap["w"]},
+)
+# Разновидности колонтитулов секции
+_HEADER_FOOTER_KINDS = ("footer", "header", "first_page_footer", "first_page_header",
+                        "even_page_footer", "even_page_header")
+
+
+def has_page_field(element: etree._Element) -> bool:
+    """Есть ли поле PAGE в <w:fldSimple w:instr="…"> или <w:instrText> внутри element."""
+    return _HAS_PAGE_FIELD(element)
+
 
-def part_has_page_field(part) -> bool:
+def part_has_page_field(part, checked: dict[str, bool] | None = None) -> bool:
     """
-    Проверяем, встречается ли PAGE в любом <w:fldSimple w:instr="…">
-    или <w:instrText> в данном header/footer.
+    Проверяет часть колонтитула (HeaderPart/FooterPart). checked - кэш результатов
+    по имени части: части, общие для нескольких секций, разбираются один раз.
     """
     if part is None:
         return False
-    xml = part._element.xml           # сырой XML колонтитула
-    return ' PAGE ' in xml.upper()    # минимальная, но надёжная проверка
-
-def section_has_page(section) -> bool:
-    """Проверяем ВСЕ разновидности колонтитулов секции."""
-    return any(
-        part_has_page_field(p) for p in (
-            section.footer, section.header,
-            section.first_page_footer, section.first_page_header,
-            section.even_page_footer,  section.even_page_header
-        )
-    )
+    if checked is None:
+        return has_page_field(part.element)
+    name = str(part.partname)
+    if name not in checked:
+        checked[name] = has_page_field(part.element)
+    return checked[name]
+
+
+def section_parts(sections: Iterable[Section]) -> Iterator[list]:
+    """
+    Части всех колонтитулов каждой секции. Секция без собственного колонтитула
+    наследует его от предыдущей; новые части при этом не создаются.
+    """
+    inherited = dict.fromkeys(_HEADER_FOOTER_KINDS)
+    for section in sections:
+        for kind in _HEADER_FOOTER_KINDS:
+            header_footer = getattr(section, kind)
+            if not header_footer.is_linked_to_previous:
+                inherited[kind] = header_footer._definition
+        yield list(inherited.values())
+
 
 def check_page_numbering(doc: docx.Document(), result: ValidationResult):
-    missing = [str(i) for i, sec in enumerate(doc.sections, 1)
-               if not section_has_page(sec)]
-    if missing:
-        result.add_err(ErrCause.INVALID_PAGE_NUMBERING, "numbering doesn't exist")
+    checked: dict[str, bool] = {}
+    for parts in section_parts(doc.sections):
+        if not any(part_has_page_field(part, checked) for part in parts):
+            result.add_err(ErrCause.INVALID_PAGE_NUMBERING, "numbering doesn't exist")
+            return
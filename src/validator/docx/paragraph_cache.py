@@ -0,0 +1,137 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+import docx
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.shared import Length
+from docx.text.paragraph import Paragraph
+from lxml import etree
+
+from src.validator.docx.format_checker import (ParagraphFindings, check_margins, check_paragraph, empty_report,
+                                               merge_findings)
+from src.validator.docx.page_numbering_checker import check_page_numbering
+from src.validator.docx.styles import StyleTable
+from src.validator.result import ValidationResult, ErrCause
+
+# Меняется вместе с правилами проверки абзацев, чтобы старые записи кэша не использовались
+CACHE_VERSION = 2
+
+
+def paragraph_fingerprint(para: Paragraph, table: StyleTable) -> str:
+    """
+    Отпечаток абзаца: XML w:p и итоговые свойства стилей, от которых зависит его проверка
+    (стиль абзаца и символьные стили его run вместе с docDefaults и base_style).
+    Правка styles.xml меняет отпечатки только тех абзацев, чьи стили она затронула.
+    """
+    p_style = para._p.style
+    r_styles = sorted({r.style for r in para._p.r_lst}, key=str)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((CACHE_VERSION, table.paragraph(p_style), table.is_heading(p_style),
+                   [(r_style, table.run(p_style, r_style)) for r_style in r_styles])).encode())
+    h.update(etree.tostring(para._p))
+    return h.hexdigest()
+
+
+def document_cache_path(directory: str | Path, identity: str) -> Path:
+    """
+    Файл кэша работы в directory. identity - то, что не меняется между ревизиями
+    (например, идентификатор студента и работы), а не содержимое файла.
+    """
+    name = hashlib.blake2b(identity.encode(), digest_size=16).hexdigest()
+    return Path(directory) / f"{name}.docx-cache.json"
+
+
+def _encode(description: Any) -> Any:
+    """Сообщения check_paragraph - строки, WD_ALIGN_PARAGRAPH, множитель (float) или Length."""
+    if isinstance(description, WD_ALIGN_PARAGRAPH):
+        return {"alignment": description.name}
+    if isinstance(description, Length):
+        return {"length": int(description)}
+    return description
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "alignment" in value:
+            return WD_ALIGN_PARAGRAPH[value["alignment"]]
+        return Length(value["length"])
+    return value
+
+
+class ParagraphCache:
+    """
+    Кэш нарушений абзацев по отпечатку. Переживает перезапуск через save/load (JSON),
+    так что при повторной сдаче работы проверяются только изменённые абзацы.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, ParagraphFindings] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, fingerprint: str) -> ParagraphFindings | None:
+        return self._entries.get(fingerprint)
+
+    def put(self, fingerprint: str, findings: ParagraphFindings):
+        self._entries[fingerprint] = findings
+
+    def save(self, path: str | Path):
+        entries = {
+            fingerprint: {
+                "errors": {cause.name: _encode(description) for cause, description in findings.errors.items()},
+                "only_tnr": findings.only_tnr,
+            }
+            for fingerprint, findings in self._entries.items()
+        }
+        Path(path).write_text(json.dumps({"version": CACHE_VERSION, "paragraphs": entries}, ensure_ascii=False),
+                              encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: str | Path) -> "ParagraphCache":
+        """Загружает кэш; отсутствующий файл или кэш другой версии дают пустой кэш."""
+        cache = cls()
+        path = Path(path)
+        if not path.exists():
+            return cache
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("version") != CACHE_VERSION:
+            return cache
+        for fingerprint, entry in data["paragraphs"].items():
+            cache.put(fingerprint, ParagraphFindings(
+                {ErrCause[cause]: _decode(description) for cause, description in entry["errors"].items()},
+                entry["only_tnr"],
+            ))
+        return cache
+
+
+def check_docx_cached(doc: docx.Document, cache: ParagraphCache) -> ValidationResult:
+    """
+    Проверяет документ как start_check_docx_file, переиспользуя нарушения неизменённых
+    абзацев из cache. Заново проверяются только абзацы с новым отпечатком; их результаты
+    добавляются в кэш. Поля и нумерация страниц проверяются целиком - это не зависит
+    от числа абзацев.
+    """
+    result = ValidationResult.empty()
+    results = empty_report()
+    check_margins(doc, result, results)
+
+    table = StyleTable.from_document(doc)
+    findings = []
+    checked = 0
+    paragraphs = doc.paragraphs
+    for para in paragraphs:
+        fingerprint = paragraph_fingerprint(para, table)
+        paragraph = cache.get(fingerprint)
+        if paragraph is None:
+            paragraph = check_paragraph(para, table)
+            cache.put(fingerprint, paragraph)
+            checked += 1
+        findings.append(paragraph)
+    merge_findings(findings, result, results)
+
+    check_page_numbering(doc, result)
+    result.log.append(f"Перепроверено абзацев: {checked} из {len(paragraphs)}")
+    return result
@@ -1,15 +1,20 @@
-import docx
-
 from src.validator.docx.content_checker import extract_and_check_headings_from_docx
-from src.validator.docx.format_checker import check_formatting
+from src.validator.docx.columnar import FormattingTable, validate_columnar
+from src.validator.docx.loader import load_docx
 from src.validator.docx.page_numbering_checker import check_page_numbering
 from src.validator.result import ValidationResult
+from src.validator.source import Source
 
 
-def start_check_docx_file(path: str) -> ValidationResult:
-    doc = docx.Document(path)
+def start_check_docx_file(path: Source) -> ValidationResult:
+    """
+    Проверяет .docx по пути или из памяти (bytes, memoryview, mmap, бинарный поток).
+    Изображения и прочие вложения не распаковываются (см. load_docx).
+    """
+    doc = load_docx(path)
     result = ValidationResult.empty()
-    check_formatting(doc, result)
+    # Правила check_formatting над колоночной таблицей run и абзацев
+    validate_columnar(FormattingTable(doc), result)
     check_page_numbering(doc, result)
     # print(extract_and_check_headings_from_docx(doc))
     print(result.errors)
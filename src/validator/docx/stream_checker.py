@@ -0,0 +1,178 @@
+import posixpath
+import zipfile
+
+from docx.enum.text import WD_ALIGN_PARAGRAPH as WDAP
+from docx.oxml.ns import qn
+from docx.oxml.simpletypes import ST_SignedTwipsMeasure
+from docx.shared import RGBColor
+from lxml import etree
+
+from src.validator.docx.format_checker import is_tnr
+from src.validator.docx.page_numbering_checker import has_page_field
+from src.validator.docx.styles import StyleTable, has_text
+from src.validator.result import ValidationResult, ErrCause
+from src.validator.source import Source, as_file
+
+_PACKAGE_RELS = "_rels/.rels"
+BLACK = RGBColor(0x00, 0x00, 0x00)
+# Разновидности колонтитулов секции (как section.footer, first_page_footer и т.д. в python-docx)
+_HEADER_FOOTER_KINDS = [(ref, kind) for ref in ("w:footerReference", "w:headerReference")
+                        for kind in ("default", "first", "even")]
+
+
+def _rels_name(part_name: str) -> str:
+    directory, name = posixpath.split(part_name)
+    return posixpath.join(directory, "_rels", name + ".rels")
+
+
+def read_rels(zf: zipfile.ZipFile, part_name: str) -> dict[str, tuple[str, str]]:
+    """Связи части пакета: rId -> (тип связи без URI-префикса, имя целевой части)."""
+    try:
+        root = etree.fromstring(zf.read(_rels_name(part_name) if part_name else _PACKAGE_RELS))
+    except KeyError:
+        return {}
+    base = posixpath.dirname(part_name)
+    rels = {}
+    for rel in root:
+        if rel.get("TargetMode") == "External":
+            continue
+        target = rel.get("Target")
+        target = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join(base, target))
+        rels[rel.get("Id")] = (rel.get("Type").rsplit("/", 1)[-1], target)
+    return rels
+
+
+def main_part_name(zf: zipfile.ZipFile) -> str:
+    for rel_type, target in read_rels(zf, "").values():
+        if rel_type == "officeDocument":
+            return target
+    return "word/document.xml"
+
+
+def _val(elm: etree._Element | None, attr: str = "w:val") -> str | None:
+    return None if elm is None else elm.get(qn(attr))
+
+
+class _DocxStreamState:
+    def __init__(self, styles: StyleTable):
+        self.styles = styles
+        self.only_tnr = True
+        self.first_section = True
+        # Ссылки на колонтитулы каждой секции: (тег ссылки, w:type) -> r:id
+        self.sections: list[dict[tuple[str, str], str]] = []
+
+
+def _check_run(r: etree._Element, p_style: str | None, heading: bool, state: _DocxStreamState,
+               result: ValidationResult):
+    if not has_text(r):
+        return
+    rPr = r.find(qn("w:rPr"))
+    name = _val(rPr.find(qn("w:rFonts")), "w:ascii") if rPr is not None else None
+    if name and "Times New Roman" not in name:
+        result.add_err(ErrCause.INVALID_FONT, "wrong font name: " + str(name))
+
+    style = state.styles.effective_run(p_style, rPr)
+    if style.size and not heading and not (12.01 <= style.size.pt <= 14.01):
+        result.add_err(ErrCause.INVALID_FONT_SIZE, "wrong font size: " + str(style.size))
+    if style.color and not heading and style.color != BLACK:
+        result.add_err(ErrCause.INVALID_FONT_COLOR, "wrong color rgb: " + str(style.color))
+    if style.font is not None and not is_tnr(style.font):
+        state.only_tnr = False
+
+
+def _check_section(sectPr: etree._Element, state: _DocxStreamState, result: ValidationResult):
+    state.sections.append({(ref.tag, ref.get(qn("w:type"))): ref.get(qn("r:id"))
+                           for ref in sectPr if ref.tag in (qn("w:footerReference"), qn("w:headerReference"))})
+    if not state.first_section:
+        return
+    state.first_section = False
+    left = _val(sectPr.find(qn("w:pgMar")), "w:left")
+    if left is None:
+        return
+    left_margin_mm = ST_SignedTwipsMeasure.from_xml(left) / 36000.0
+    if not (29.5 <= left_margin_mm <= 30.5):
+        result.add_err(ErrCause.INVALID_PAGE_FIELDS, "left margin must be between 29.5 and 30.5")
+
+
+def _check_paragraph(p: etree._Element, state: _DocxStreamState, result: ValidationResult):
+    pPr = p.find(qn("w:pPr"))
+    p_style = _val(pPr.find(qn("w:pStyle"))) if pPr is not None else None
+    heading = state.styles.is_heading(p_style)
+    for r in p.iterfind(qn("w:r")):
+        _check_run(r, p_style, heading, state, result)
+
+    if has_text(p):
+        style = state.styles.effective_paragraph(pPr)
+        if style.alignment is not None and style.alignment not in (WDAP.JUSTIFY, WDAP.CENTER):
+            result.add_err(ErrCause.INVALID_TEXT_ALIGNMENT, style.alignment)
+        line_spacing = style.line_spacing
+        if line_spacing and abs(line_spacing - 1.5) > 0.1:
+            result.add_err(ErrCause.INVALID_LINE_SPACING, line_spacing)
+
+    sectPr = pPr.find(qn("w:sectPr")) if pPr is not None else None
+    if sectPr is not None:
+        _check_section(sectPr, state, result)
+
+
+def _has_page_field(zf: zipfile.ZipFile, part_name: str | None) -> bool:
+    if part_name is None:
+        return False
+    return has_page_field(etree.fromstring(zf.read(part_name)))
+
+
+def _check_page_numbering(zf: zipfile.ZipFile, document: str, sections: list[dict[tuple[str, str], str]],
+                          result: ValidationResult):
+    """
+    Как check_page_numbering: у каждой секции ищем поле PAGE во всех шести колонтитулах.
+    Секция без собственной ссылки наследует колонтитул предыдущей; каждая часть читается один раз.
+    """
+    rels = read_rels(zf, document)
+    inherited: dict[tuple[str, str], str | None] = {}
+    checked: dict[str | None, bool] = {}
+    for refs in sections:
+        own = {key: rels.get(r_id, (None, None))[1] for key, r_id in refs.items()}
+        has_page = False
+        for ref, kind in _HEADER_FOOTER_KINDS:
+            key = (qn(ref), kind)
+            part_name = inherited[key] = own.get(key, inherited.get(key))
+            if part_name not in checked:
+                checked[part_name] = _has_page_field(zf, part_name)
+            has_page = has_page or checked[part_name]
+        if not has_page:
+            result.add_err(ErrCause.INVALID_PAGE_NUMBERING, "numbering doesn't exist")
+            return
+
+
+def stream_check_docx_file(path: Source) -> ValidationResult:
+    """
+    Потоковая проверка .docx: word/document.xml читается из архива через iterparse,
+    свойства w:rPr/w:pPr проверяются по мере разбора, обработанные абзацы удаляются из дерева.
+    Проверки и сообщения совпадают с start_check_docx_file (check_formatting и
+    check_page_numbering), но без объектов python-docx и без загрузки остального пакета.
+    """
+    result = ValidationResult.empty()
+    with zipfile.ZipFile(as_file(path)) as zf:
+        document = main_part_name(zf)
+        styles_name = next((target for rel_type, target in read_rels(zf, document).values()
+                            if rel_type == "styles"), None)
+        styles = etree.fromstring(zf.read(styles_name)) if styles_name in zf.NameToInfo else None
+        state = _DocxStreamState(StyleTable(styles))
+
+        body_tag = qn("w:body")
+        with zf.open(document) as f:
+            for _, elm in etree.iterparse(f, events=("end",)):
+                parent = elm.getparent()
+                if parent is None or parent.tag != body_tag:
+                    continue
+                if elm.tag == qn("w:p"):
+                    _check_paragraph(elm, state, result)
+                elif elm.tag == qn("w:sectPr"):
+                    _check_section(elm, state, result)
+                elm.clear()
+                while elm.getprevious() is not None:
+                    del parent[0]
+
+        if not state.only_tnr:
+            result.add_err(ErrCause.INVALID_FONT, "incorrect font")
+        _check_page_numbering(zf, document, state.sections, result)
+    return result
@@ -0,0 +1,200 @@
+from typing import Any, NamedTuple
+
+import docx
+from docx.enum.text import WD_ALIGN_PARAGRAPH as WDAP, WD_LINE_SPACING
+from docx.oxml.ns import qn
+from docx.oxml.simpletypes import ST_HexColor, ST_HexColorAuto, ST_HpsMeasure, ST_SignedTwipsMeasure
+from docx.shared import Length, Pt, RGBColor
+from lxml import etree
+
+
+class EffectiveStyle(NamedTuple):
+    """
+    Итоговые свойства текста с учётом наследования: docDefaults -> стиль абзаца и его
+    base_style -> символьный стиль -> прямое форматирование. None - свойство нигде не задано.
+    """
+    font: str | None = None
+    size: Length | None = None
+    color: RGBColor | None = None
+    alignment: WDAP | None = None
+    # w:spacing/@w:line и @w:lineRule наследуются по отдельности, см. line_spacing
+    line: Length | None = None
+    line_rule: WD_LINE_SPACING | None = None
+    first_line_indent: Length | None = None
+    left_indent: Length | None = None
+    # w:outlineLvl: 0-8 - уровень заголовка, 9 - основной текст
+    outline_level: int | None = None
+
+    @property
+    def line_spacing(self) -> float | Length | None:
+        """Как ParagraphFormat.line_spacing: множитель строк или Length для точного интервала."""
+        if self.line is None:
+            return None
+        if self.line_rule is None or self.line_rule == WD_LINE_SPACING.MULTIPLE:
+            return self.line / Pt(12)
+        return self.line
+
+
+# Полные имена тегов и атрибутов вычисляются один раз, а не на каждый run
+_W_VAL = qn("w:val")
+_W_T = qn("w:t")
+_W_RFONTS, _W_ASCII, _W_SZ, _W_COLOR = qn("w:rFonts"), qn("w:ascii"), qn("w:sz"), qn("w:color")
+_W_JC, _W_SPACING, _W_IND, _W_OUTLINE_LVL = qn("w:jc"), qn("w:spacing"), qn("w:ind"), qn("w:outlineLvl")
+_W_PSTYLE, _W_RSTYLE = qn("w:pStyle"), qn("w:rStyle")
+
+
+def _val(elm: etree._Element | None, attr: str = "w:val") -> str | None:
+    if elm is None:
+        return None
+    return elm.get(_W_VAL if attr == "w:val" else qn(attr))
+
+
+def has_text(elm: etree._Element) -> bool:
+    """Есть ли в run или абзаце видимый текст; форматирование пустых run не проверяется."""
+    return any(t.text and not t.text.isspace() for t in elm.iter(_W_T))
+
+
+def run_props(rPr: etree._Element | None) -> dict[str, Any]:
+    """Свойства, явно заданные в w:rPr (только присутствующие)."""
+    props: dict[str, Any] = {}
+    if rPr is None:
+        return props
+    rFonts = rPr.find(_W_RFONTS)
+    font = None if rFonts is None else rFonts.get(_W_ASCII)
+    if font is not None:
+        props["font"] = font
+    size = _val(rPr.find(_W_SZ))
+    if size is not None:
+        props["size"] = ST_HpsMeasure.from_xml(size)
+    color = _val(rPr.find(_W_COLOR))
+    if color is not None:
+        color = ST_HexColor.from_xml(color)
+        props["color"] = None if color == ST_HexColorAuto.AUTO else color
+    return props
+
+
+def paragraph_props(pPr: etree._Element | None) -> dict[str, Any]:
+    """Свойства, явно заданные в w:pPr (только присутствующие)."""
+    props: dict[str, Any] = {}
+    if pPr is None:
+        return props
+    jc = _val(pPr.find(_W_JC))
+    if jc is not None:
+        props["alignment"] = WDAP.from_xml(jc)
+    spacing = pPr.find(_W_SPACING)
+    if _val(spacing, "w:line") is not None:
+        props["line"] = ST_SignedTwipsMeasure.from_xml(_val(spacing, "w:line"))
+    if _val(spacing, "w:lineRule") is not None:
+        props["line_rule"] = WD_LINE_SPACING.from_xml(_val(spacing, "w:lineRule"))
+    ind = pPr.find(_W_IND)
+    if ind is not None:
+        first_line, hanging = _val(ind, "w:firstLine"), _val(ind, "w:hanging")
+        if hanging is not None:
+            props["first_line_indent"] = -ST_SignedTwipsMeasure.from_xml(hanging)
+        elif first_line is not None:
+            props["first_line_indent"] = ST_SignedTwipsMeasure.from_xml(first_line)
+        left = _val(ind, "w:left") or _val(ind, "w:start")
+        if left is not None:
+            props["left_indent"] = ST_SignedTwipsMeasure.from_xml(left)
+    outline_level = _val(pPr.find(_W_OUTLINE_LVL))
+    if outline_level is not None:
+        props["outline_level"] = int(outline_level)
+    return props
+
+
+_RUN_FIELDS = ("font", "size", "color")
+# Встроенные стили заголовков без уровня структуры
+_HEADING_NAMES = ("title", "subtitle")
+
+
+def _run_only(props: dict[str, Any]) -> dict[str, Any]:
+    """Символьный стиль влияет только на свойства run."""
+    return {name: value for name, value in props.items() if name in _RUN_FIELDS}
+
+
+class StyleTable:
+    """
+    Таблица итоговых свойств стилей, построенная один раз по styles.xml. Для run и абзаца
+    достаточно одного обращения к таблице и наложения прямого форматирования,
+    цепочки base_style для каждого run не обходятся.
+    """
+
+    def __init__(self, styles: etree._Element | None):
+        self._by_id: dict[str, etree._Element] = {}
+        self._default: dict[str, str] = {}
+        self._resolved: dict[str, dict[str, Any]] = {}
+        self._paragraphs: dict[str | None, EffectiveStyle] = {}
+        self._runs: dict[tuple[str | None, str | None], EffectiveStyle] = {}
+        self._headings: dict[str | None, bool] = {}
+        self._defaults: dict[str, Any] = {}
+        if styles is None:
+            return
+        defaults = styles.find(qn("w:docDefaults"))
+        if defaults is not None:
+            self._defaults = {**paragraph_props(defaults.find(f"{qn('w:pPrDefault')}/{qn('w:pPr')}")),
+                              **run_props(defaults.find(f"{qn('w:rPrDefault')}/{qn('w:rPr')}"))}
+        for style in styles.iterfind(qn("w:style")):
+            style_id = style.get(qn("w:styleId"))
+            self._by_id.setdefault(style_id, style)
+            if style.get(qn("w:default")) in ("1", "true", "on"):
+                # по спецификации действует последний стиль по умолчанию
+                self._default[style.get(qn("w:type"))] = style_id
+
+    @classmethod
+    def from_document(cls, doc: docx.Document) -> "StyleTable":
+        return cls(doc.styles.element)
+
+    def _style_id(self, style_id: str | None, style_type: str) -> str | None:
+        """Как python-docx: неизвестный стиль или стиль другого типа заменяется стилем по умолчанию."""
+        style = self._by_id.get(style_id) if style_id is not None else None
+        if style is None or style.get(qn("w:type")) != style_type:
+            return self._default.get(style_type)
+        return style_id
+
+    def _resolve(self, style_id: str | None, seen: frozenset = frozenset()) -> dict[str, Any]:
+        """Свойства стиля вместе с унаследованными от base_style (без docDefaults)."""
+        if style_id is None or style_id not in self._by_id or style_id in seen:
+            return {}
+        if style_id not in self._resolved:
+            style = self._by_id[style_id]
+            base = self._resolve(_val(style.find(qn("w:basedOn"))), seen | {style_id})
+            self._resolved[style_id] = {**base, **paragraph_props(style.find(qn("w:pPr"))),
+                                        **run_props(style.find(qn("w:rPr")))}
+        return self._resolved[style_id]
+
+    def paragraph(self, style_id: str | None) -> EffectiveStyle:
+        """Итоговые свойства стиля абзаца style_id (w:pStyle; None - стиль по умолчанию)."""
+        if style_id not in self._paragraphs:
+            props = self._resolve(self._style_id(style_id, "paragraph"))
+            self._paragraphs[style_id] = EffectiveStyle(**{**self._defaults, **props})
+        return self._paragraphs[style_id]
+
+    def is_heading(self, style_id: str | None) -> bool:
+        """
+        Стиль абзаца style_id - заголовок: уровень структуры 0-8 (с учётом base_style)
+        или встроенный стиль Title/Subtitle. Размер и цвет таких абзацев не проверяются.
+        """
+        if style_id not in self._headings:
+            outline_level = self.paragraph(style_id).outline_level
+            style = self._by_id.get(self._style_id(style_id, "paragraph"))
+            name = _val(style.find(qn("w:name"))) if style is not None else None
+            self._headings[style_id] = ((outline_level is not None and outline_level < 9)
+                                        or (name or "").lower() in _HEADING_NAMES)
+        return self._headings[style_id]
+
+    def run(self, p_style: str | None, r_style: str | None) -> EffectiveStyle:
+        """Итоговые свойства run со стилем r_style (w:rStyle) в абзаце со стилем p_style."""
+        key = (p_style, r_style)
+        if key not in self._runs:
+            char_props = _run_only(self._resolve(self._style_id(r_style, "character")))
+            self._runs[key] = self.paragraph(p_style)._replace(**char_props)
+        return self._runs[key]
+
+    def effective_paragraph(self, pPr: etree._Element | None) -> EffectiveStyle:
+        style = self.paragraph(_val(pPr.find(_W_PSTYLE)) if pPr is not None else None)
+        return style._replace(**paragraph_props(pPr))
+
+    def effective_run(self, p_style: str | None, rPr: etree._Element | None) -> EffectiveStyle:
+        style = self.run(p_style, _val(rPr.find(_W_RSTYLE)) if rPr is not None else None)
+        return style._replace(**run_props(rPr))
+
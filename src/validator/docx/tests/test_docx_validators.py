@@ -0,0 +1,333 @@
+import io
+import zipfile
+from pathlib import Path
+
+import docx
+from docx.enum.section import WD_SECTION
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml import OxmlElement
+from docx.oxml.ns import nsmap, qn
+from docx.shared import Mm, Pt, RGBColor
+from lxml import etree
+
+from src.validator.docx import loader, page_numbering_checker, vkr_word
+from src.validator.docx.columnar import FormattingTable, document_statistics, offending_paragraphs, validate_columnar
+from src.validator.docx.content_checker import extract_and_check_headings_from_docx
+from src.validator.docx.format_checker import check_formatting
+from src.validator.docx.loader import load_docx
+from src.validator.docx.paragraph_cache import ParagraphCache, check_docx_cached, document_cache_path
+from src.validator.docx.page_numbering_checker import check_page_numbering, has_page_field
+from src.validator.docx.start_checks import start_check_docx_file
+from src.validator.docx.stream_checker import stream_check_docx_file
+from src.validator.docx.styles import StyleTable
+from src.validator.docx.text_index import DocumentIndex
+from src.validator.heading_match import longest_ordered
+from src.validator.result import ErrCause, ValidationResult
+
+_ROOT = Path(__file__).parents[4]
+
+
+def _add_page_field(paragraph):
+    field = OxmlElement("w:fldSimple")
+    field.set(qn("w:instr"), " PAGE ")
+    paragraph._p.append(field)
+
+
+def _thesis(font="Times New Roman", size=14, color=None, alignment=WD_ALIGN_PARAGRAPH.JUSTIFY,
+            line_spacing=1.5, numbered=True) -> bytes:
+    """Небольшой документ из двух секций с заданным форматированием основного текста."""
+    doc = docx.Document()
+    doc.styles["Normal"].font.name = "Times New Roman"
+    doc.styles["Normal"].font.size = Pt(14)
+    doc.sections[0].left_margin = Mm(30)
+    for text in ("ВВЕДЕНИЕ", "Text of the introduction.", "ЗАКЛЮЧЕНИЕ"):
+        paragraph = doc.add_paragraph()
+        paragraph.alignment = alignment
+        paragraph.paragraph_format.line_spacing = line_spacing
+        run = paragraph.add_run(text)
+        run.font.name = font
+        run.font.size = Pt(size)
+        if color is not None:
+            run.font.color.rgb = color
+    if numbered:
+        _add_page_field(doc.sections[0].footer.paragraphs[0])
+    doc.add_section(WD_SECTION.NEW_PAGE)
+    doc.add_paragraph("Appendix")
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+# Тесты для stream_check_docx_file: результат совпадает с start_check_docx_file
+def test_stream_checker_matches_python_docx():
+    sources = [_ROOT / "good_docx.docx", _ROOT / "invalid_docx.docx",
+               _thesis(), _thesis(font="Arial", size=16, color=RGBColor(0xFF, 0, 0)),
+               _thesis(alignment=WD_ALIGN_PARAGRAPH.LEFT, line_spacing=Pt(18), numbered=False)]
+    for source in sources:
+        expected = start_check_docx_file(source)
+        assert stream_check_docx_file(source).errors == expected.errors
+
+
+def test_stream_checker_reports_violations():
+    result = stream_check_docx_file(_thesis(font="Arial", size=16, color=RGBColor(0xFF, 0, 0),
+                                            alignment=WD_ALIGN_PARAGRAPH.LEFT, numbered=False))
+
+    assert result.errors[ErrCause.INVALID_FONT] == "incorrect font"
+    assert result.errors[ErrCause.INVALID_FONT_SIZE] == "wrong font size: " + str(Pt(16))
+    assert result.errors[ErrCause.INVALID_FONT_COLOR] == "wrong color rgb: FF0000"
+    assert result.errors[ErrCause.INVALID_TEXT_ALIGNMENT] == WD_ALIGN_PARAGRAPH.LEFT
+    assert ErrCause.INVALID_PAGE_NUMBERING in result.errors
+    assert ErrCause.INVALID_PAGE_FIELDS not in result.errors
+
+
+# Тесты для StyleTable: свойства, унаследованные от стилей
+def test_style_table_resolves_inherited_properties():
+    doc = docx.Document()
+    normal = doc.styles["Normal"]
+    normal.font.name = "Times New Roman"
+    normal.font.size = Pt(11)
+    normal.paragraph_format.line_spacing = 1.5
+    heading = doc.styles["Heading 1"]
+    heading.font.color.rgb = RGBColor(0x2F, 0x54, 0x96)
+    heading.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    doc.add_paragraph("Body text")
+    doc.add_heading("Heading text", level=1)
+    table = StyleTable.from_document(doc)
+
+    body, title = doc.paragraphs
+    body_style = table.effective_run(body._p.style, body.runs[0]._r.rPr)
+    title_style = table.effective_run(title._p.style, title.runs[0]._r.rPr)
+
+    assert body_style.font == "Times New Roman" and body_style.size == Pt(11)
+    assert title_style.color == RGBColor(0x2F, 0x54, 0x96)
+    assert table.effective_paragraph(title._p.pPr).alignment == WD_ALIGN_PARAGRAPH.CENTER
+    assert table.effective_paragraph(body._p.pPr).line_spacing == 1.5
+    assert table.is_heading(title._p.style) and table.is_heading("Title")
+    assert not table.is_heading(body._p.style) and not table.is_heading("TOCHeading")
+
+    # Размер и цвет заголовков (Heading 1 - 16pt, 2F5496) основным текстом не считаются
+    heading.font.size = Pt(16)
+    source = _save(doc)
+    result = start_check_docx_file(source)
+    assert result.errors[ErrCause.INVALID_FONT_SIZE] == "wrong font size: " + str(Pt(11))
+    assert ErrCause.INVALID_FONT_COLOR not in result.errors
+    assert stream_check_docx_file(source).errors == result.errors
+    expected, columnar = ValidationResult.empty(), ValidationResult.empty()
+    check_formatting(load_docx(source), expected)
+    validate_columnar(FormattingTable(load_docx(source)), columnar)
+    assert columnar.errors == expected.errors
+
+
+# Тесты для vkr_word.analyze_docx
+def test_analyze_docx_parses_once(monkeypatch):
+    path = _ROOT / "good_docx.docx"
+    expected_text = vkr_word.load_docx_text(str(path))
+    opened = []
+    texts = []
+    monkeypatch.setattr(vkr_word, "load_docx", lambda *args: opened.append(args) or load_docx(*args))
+    monkeypatch.setattr(vkr_word, "check_mandatory_sections", lambda index: texts.append(index.text) or {})
+
+    report = vkr_word.analyze_docx(str(path))
+
+    assert len(opened) == 1
+    assert texts == [expected_text]
+    assert report["Форматирование"]["font_check"]
+
+
+def test_analyze_docx_accepts_12pt_text(tmp_path):
+    path = tmp_path / "thesis.docx"
+    path.write_bytes(_thesis(size=12, alignment=WD_ALIGN_PARAGRAPH.CENTER))
+
+    report = vkr_word.analyze_docx(str(path))["Форматирование"]
+
+    assert report["font_size_check"] and report["alignment_check"]
+    path.write_bytes(_thesis(size=11, alignment=WD_ALIGN_PARAGRAPH.LEFT))
+    report = vkr_word.check_formatting(str(path))
+    assert not report["font_size_check"] and not report["alignment_check"]
+
+
+# Тесты для check_page_numbering
+def test_page_field_detection():
+    def footer(xml):
+        return etree.fromstring(f'<w:ftr xmlns:w="{nsmap["w"]}"><w:p>{xml}</w:p></w:ftr>')
+
+    assert has_page_field(footer('<w:fldSimple w:instr=" PAGE   \\* MERGEFORMAT "/>'))
+    assert has_page_field(footer('<w:r><w:instrText>page</w:instrText></w:r>'))
+    assert not has_page_field(footer('<w:fldSimple w:instr=" NUMPAGES "/>'))
+    assert not has_page_field(footer('<w:r><w:t> PAGE </w:t></w:r>'))
+
+
+def test_shared_footer_inspected_once(monkeypatch):
+    doc = docx.Document()
+    _add_page_field(doc.sections[0].footer.paragraphs[0])
+    for _ in range(5):
+        doc.add_section(WD_SECTION.NEW_PAGE)
+    inspected = []
+    monkeypatch.setattr(page_numbering_checker, "has_page_field",
+                        lambda element: inspected.append(element) or has_page_field(element))
+    parts = len(list(doc.part.package.iter_parts()))
+    result = ValidationResult.empty()
+
+    check_page_numbering(doc, result)
+
+    assert not result.errors
+    assert len(inspected) == 1
+    # Проверка не добавляет в документ новых колонтитулов
+    assert len(list(doc.part.package.iter_parts())) == parts
+
+
+# Тесты для load_docx
+def test_load_docx_skips_media(monkeypatch):
+    path = _ROOT / "good_docx.docx"
+    expected = docx.Document(str(path))
+    read = []
+    zip_read = zipfile.ZipFile.read
+    monkeypatch.setattr(zipfile.ZipFile, "read", lambda self, name, *args: read.append(name) or zip_read(self, name, *args))
+
+    doc = load_docx(path)
+
+    assert "word/media/image1.png" not in read
+    assert "word/theme/theme1.xml" not in read
+    assert [p.text for p in doc.paragraphs] == [p.text for p in expected.paragraphs]
+    assert start_check_docx_file(path).errors == stream_check_docx_file(path).errors
+
+
+def test_load_docx_falls_back_when_internals_change(monkeypatch):
+    path = _ROOT / "good_docx.docx"
+    expected = [p.text for p in docx.Document(str(path)).paragraphs]
+
+    def renamed_internals(pkg_file):
+        raise AttributeError("type object 'PackageReader' has no attribute '_srels_for'")
+
+    # Внутренний API python-docx изменился: документ открывается через docx.Document
+    monkeypatch.setattr(loader, "_read_package", renamed_internals)
+
+    for source in (path, path.read_bytes()):
+        assert [p.text for p in load_docx(source).paragraphs] == expected
+
+
+# Тесты для DocumentIndex
+def test_document_index_content_checks():
+    references = [f"{n}. Author {n}. Very long title of the referenced work, volume {n}." * 3 for n in range(1, 201)]
+    paragraphs = ["СОДЕРЖАНИЕ", "Введение ..... 3", "Глава 1 ..... 5", "Заключение ..... 40",
+                  "Список использованных источников ..... 42", "ВВЕДЕНИЕ",
+                  "Text with citations " + " ".join(f"[{n}]" for n in range(1, 201)),
+                  "ЗАКЛЮЧЕНИЕ", "СПИСОК ИСПОЛЬЗОВАННЫХ ИСТОЧНИКОВ", *references,
+                  "ПРИЛОЖЕНИЕ А", "1. Not a reference"]
+    index = DocumentIndex.from_paragraphs(paragraphs)
+
+    assert all(vkr_word.check_mandatory_sections(index).values())
+    assert vkr_word.extract_toc_headings(index) == ["Введение ..... 3", "Глава 1 ..... 5"]
+    assert "ВВЕДЕНИЕ" in vkr_word.extract_document_headings(index)
+    assert index.offsets[1] == len("СОДЕРЖАНИЕ") + 1
+
+    references_result = vkr_word.check_references_format(index)
+    assert references_result["found_in_list"] == list(range(1, 201))
+    assert references_result["order_match"]
+    assert vkr_word.check_references_format(index.text) == references_result
+
+
+# Тесты для сопоставления содержания и заголовков
+def test_toc_vs_body_reports_missing_and_order():
+    toc = ["Введение ..... 3", "Глава 1 ..... 5", "Выводы ..... 9", "Глава 2 ..... 10", "Выводы ..... 14",
+           "Глава 3 ..... 15", "Заключение ..... 20"]
+    body = ["ВВЕДЕНИЕ", "ГЛАВА 2", "Выводы", "ГЛАВА  1", "Выводы", "ЗАКЛЮЧЕНИЕ"]
+
+    result = vkr_word.check_toc_vs_body(toc, body)
+
+    assert result["missing_headings"] == ["Глава 3 ..... 15"]
+    assert not result["all_present"] and not result["order_correct"]
+    assert result["out_of_order_headings"] == ["Глава 1 ..... 5", "Выводы ..... 9"]
+    assert vkr_word.check_toc_vs_body(toc[:3], body[3:]) == {
+        "all_present": False, "order_correct": True,
+        "missing_headings": ["Введение ..... 3"], "out_of_order_headings": []}
+    assert longest_ordered([3, None, 1, 2, 2, 0, 5]) == {2, 3, 4, 6}
+
+
+def test_docx_headings_checker_reports_order():
+    doc = docx.Document()
+    doc.add_paragraph("СОДЕРЖАНИЕ")
+    for title in ("Введение", "Глава 1", "Глава 2"):
+        doc.add_paragraph(f"{title} ..... 3", style="TOC Heading")
+    for title in ("Введение", "Глава 2", "Глава 1"):
+        doc.add_heading(title, level=1)
+
+    result = extract_and_check_headings_from_docx(doc)
+
+    assert result["status"] == "failed"
+    assert result["out_of_order_headings"] == ["Глава 1"]
+
+
+# Тесты для check_docx_cached: повторная проверка только изменённых абзацев
+def _save(doc) -> bytes:
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def test_cached_check_rechecks_changed_paragraphs(tmp_path):
+    path = document_cache_path(tmp_path, "student-42/thesis")
+    doc = docx.Document(io.BytesIO(_thesis(alignment=WD_ALIGN_PARAGRAPH.LEFT, line_spacing=Pt(18))))
+    for i in range(20):
+        doc.add_paragraph(f"Paragraph {i}.")
+
+    first = _save(doc)
+    cache = ParagraphCache.load(path)
+    result = check_docx_cached(load_docx(first), cache)
+    cache.save(path)
+    assert result.errors == start_check_docx_file(first).errors
+    assert result.log == ["Перепроверено абзацев: 25 из 25"]
+
+    doc.paragraphs[1].runs[0].font.name = "Arial"
+    second = _save(doc)
+    result = check_docx_cached(load_docx(second), ParagraphCache.load(path))
+    assert result.errors == start_check_docx_file(second).errors
+    assert result.errors[ErrCause.INVALID_FONT] == "incorrect font"
+    assert result.errors[ErrCause.INVALID_TEXT_ALIGNMENT] == WD_ALIGN_PARAGRAPH.LEFT
+    assert result.log == ["Перепроверено абзацев: 1 из 25"]
+
+    # Правка стиля Normal меняет итоговые свойства всех абзацев
+    doc.styles["Normal"].font.size = Pt(16)
+    third = _save(doc)
+    result = check_docx_cached(load_docx(third), ParagraphCache.load(path))
+    assert result.errors == start_check_docx_file(third).errors
+    assert result.log == ["Перепроверено абзацев: 25 из 25"]
+
+
+def _same_values_other_attributes() -> bytes:
+    """Run с одинаковыми значениями атрибутов rFonts, но разными атрибутами (hAnsi и ascii)."""
+    doc = docx.Document()
+    doc.styles["Normal"].font.name = "Times New Roman"
+    paragraph = doc.add_paragraph()
+    for attr in ("w:hAnsi", "w:ascii"):
+        run = paragraph.add_run("Text")
+        run._r.get_or_add_rPr().append(OxmlElement("w:rFonts", {qn(attr): "Arial"}))
+    return _save(doc)
+
+
+# Тесты для FormattingTable: маски NumPy дают те же ошибки, что check_formatting
+def test_columnar_rules_match_check_formatting():
+    sources = [_ROOT / "good_docx.docx", _ROOT / "invalid_docx.docx", _thesis(),
+               _thesis(font="Arial", size=16, color=RGBColor(0xFF, 0, 0)),
+               _thesis(alignment=WD_ALIGN_PARAGRAPH.LEFT, line_spacing=Pt(18), numbered=False),
+               _same_values_other_attributes()]
+    for source in sources:
+        doc = load_docx(source)
+        expected = ValidationResult.empty()
+        expected_report = check_formatting(doc, expected)
+        result = ValidationResult.empty()
+
+        assert validate_columnar(FormattingTable(doc), result) == expected_report
+        assert result.errors == expected.errors
+
+
+def test_columnar_offending_paragraphs_and_statistics():
+    table = FormattingTable(load_docx(_thesis(font="Arial", size=16)))
+
+    # ВВЕДЕНИЕ, текст, ЗАКЛЮЧЕНИЕ (Arial 16pt) и «Appendix» с интервалом Normal
+    assert offending_paragraphs(table) == [0, 1, 2, 4]
+    assert offending_paragraphs(table, limit=2) == [0, 1]
+    stats = document_statistics(table)
+    assert stats["paragraphs"] == 5 and stats["runs"] == 4
+    assert stats["fonts"]["Arial"] == stats["sizes"][16.0]
+    assert stats["alignment_ok"] == 1.0
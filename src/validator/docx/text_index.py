@@ -0,0 +1,118 @@
+import re
+from itertools import chain, islice
+from typing import Iterable, List
+
+# Обязательные разделы и их шаблоны (ищутся в пределах одной строки)
+SECTIONS = {
+    "СОДЕРЖАНИЕ": r"\bсодержание\b",
+    "ЗАКЛЮЧЕНИЕ": r"\bзаключение\b",
+    "СПИСОК ИСПОЛЬЗОВАННЫХ ИСТОЧНИКОВ": r"\bсписок\s+использованных\s+источников\b",
+    "ПРИЛОЖЕНИЕ": r"\bприложение\s+[А-ЯA-Zа-яa-z]",
+}
+_NAMES = list(SECTIONS)
+_SECTION = re.compile("|".join(f"(?P<s{i}>{pattern})" for i, pattern in enumerate(SECTIONS.values())),
+                      re.IGNORECASE)
+_CITATION = re.compile(r"\[(\d+)\]")
+_HEADING_START = re.compile(r"^[A-ZА-Я]")
+# Конец оглавления: пункт одного из заключительных разделов
+_TOC_STOP = re.compile(r"\b(заключение|приложение|список\s+использованных\s+источников)\b", re.IGNORECASE)
+_REFERENCES_HEADING = re.compile(r"\s*список\s+использованных\s+источников\s*", re.IGNORECASE)
+_LIST_ITEM = re.compile(r"^\s*(\d+)\.\s")
+_APPENDIX_START = re.compile(r"^\s*приложение\s+[А-ЯA-Zа-яa-z]", re.IGNORECASE)
+
+
+class DocumentIndex:
+    """
+    Структурный индекс текста документа, строится за один проход по строкам
+    (абзацам; разрывы строк внутри абзаца дают отдельные строки):
+      - offsets - смещение начала каждой строки в тексте, склеенном через \\n;
+      - sections - вхождения обязательных разделов: имя -> [(строка, конец совпадения)];
+      - headings - номера строк, похожих на заголовки;
+      - citations - ссылки [n] в порядке появления: (строка, n).
+    Проверки содержания обращаются к индексу и не сканируют текст повторно.
+    """
+
+    def __init__(self, lines: Iterable[str]):
+        self.lines: List[str] = []
+        self.offsets: List[int] = []
+        self.sections: dict[str, list[tuple[int, int]]] = {name: [] for name in SECTIONS}
+        self.headings: List[int] = []
+        self.citations: List[tuple[int, int]] = []
+
+        offset = 0
+        for i, line in enumerate(lines):
+            self.lines.append(line)
+            self.offsets.append(offset)
+            offset += len(line) + 1
+            for match in _SECTION.finditer(line):
+                self.sections[_NAMES[int(match.lastgroup[1:])]].append((i, match.end()))
+            self.citations.extend((i, int(n)) for n in _CITATION.findall(line))
+            stripped = line.strip()
+            if stripped and len(stripped) < 100 and _HEADING_START.match(stripped) and not stripped.endswith('.'):
+                self.headings.append(i)
+
+    @classmethod
+    def from_text(cls, text: str) -> "DocumentIndex":
+        return cls(text.split('\n'))
+
+    @classmethod
+    def from_paragraphs(cls, paragraphs: Iterable[str]) -> "DocumentIndex":
+        return cls(line for paragraph in paragraphs for line in paragraph.split('\n'))
+
+    @property
+    def text(self) -> str:
+        return '\n'.join(self.lines)
+
+    def has_section(self, name: str) -> bool:
+        return bool(self.sections[name])
+
+    def heading_lines(self) -> List[str]:
+        return [self.lines[i].strip() for i in self.headings]
+
+    def toc_lines(self) -> List[str]:
+        """
+        Непустые строки после первого «содержание» до пункта заключительного раздела
+        (заключение, приложение, список источников), без ограничения длины оглавления.
+        """
+        if not self.sections["СОДЕРЖАНИЕ"]:
+            return []
+        start, end = self.sections["СОДЕРЖАНИЕ"][0]
+        toc = []
+        for line in chain([self.lines[start][end:]], islice(self.lines, start + 1, None)):
+            line = line.strip()
+            if not line:
+                continue
+            if _TOC_STOP.search(line):
+                break
+            toc.append(line)
+        return toc
+
+    def citation_numbers(self) -> List[int]:
+        return [n for _, n in self.citations]
+
+    def reference_numbers(self) -> List[int]:
+        """
+        Номера пунктов списка источников («1. …») от заголовка списка до приложений
+        или конца документа. Заголовком считается последняя строка, состоящая только из
+        «список использованных источников» (первые вхождения обычно в оглавлении),
+        иначе последнее вхождение фразы.
+        """
+        occurrences = self.sections["СПИСОК ИСПОЛЬЗОВАННЫХ ИСТОЧНИКОВ"]
+        if not occurrences:
+            return []
+        start, end = next(((i, e) for i, e in reversed(occurrences) if _REFERENCES_HEADING.fullmatch(self.lines[i])),
+                          occurrences[-1])
+        numbers = []
+        for line in chain([self.lines[start][end:]], islice(self.lines, start + 1, None)):
+            if _APPENDIX_START.match(line):
+                break
+            item = _LIST_ITEM.match(line)
+            if item:
+                numbers.append(int(item.group(1)))
+        return numbers
+
+
+def as_index(doc: str | DocumentIndex) -> DocumentIndex:
+    if isinstance(doc, DocumentIndex):
+        return doc
+    return DocumentIndex.from_text(doc)
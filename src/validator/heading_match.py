@@ -0,0 +1,103 @@
+import re
+from bisect import bisect_right
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional, Sequence
+
+# Отточие и номер страницы в конце пункта содержания: «Введение . . . . 4», «Введение\t4»
+_LEADER = re.compile(r"(?:(?:\s*\.)+\s*\d*|\t\s*\d+)\s*$")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_heading(heading: str) -> str:
+    """Заголовок без отточия и номера страницы, без лишних пробелов и регистра."""
+    return _SPACES.sub(" ", _LEADER.sub("", heading)).strip().casefold()
+
+
+def longest_ordered(positions: Sequence[Optional[int]]) -> set[int]:
+    """
+    Индексы самой длинной неубывающей подпоследовательности positions (None пропускаются),
+    O(n log n). Пункты вне неё - минимальный набор пунктов, стоящих не на своём месте.
+    """
+    tails: list[int] = []  # tails[k] - индекс последнего элемента лучшей цепочки длины k + 1
+    tail_values: list[int] = []
+    previous: dict[int, int] = {}
+    for i, position in enumerate(positions):
+        if position is None:
+            continue
+        k = bisect_right(tail_values, position)
+        if k:
+            previous[i] = tails[k - 1]
+        if k == len(tails):
+            tails.append(i)
+            tail_values.append(position)
+        else:
+            tails[k] = i
+            tail_values[k] = position
+
+    chain = set()
+    i = tails[-1] if tails else None
+    while i is not None:
+        chain.add(i)
+        i = previous.get(i)
+    return chain
+
+
+class HeadingMatch(NamedTuple):
+    """Результат сопоставления пунктов содержания с заголовками текста."""
+    # Позиция каждого пункта в тексте (номер заголовка, страницы и т.п.), None - не найден
+    positions: list[Optional[int]]
+    missing: list[str]
+    out_of_order: list[str]
+
+    @property
+    def all_present(self) -> bool:
+        return not self.missing
+
+    @property
+    def order_correct(self) -> bool:
+        return not self.out_of_order
+
+
+def diagnose(toc: Sequence[str], positions: Sequence[Optional[int]]) -> HeadingMatch:
+    """
+    Отсутствующие пункты - с позицией None; не по порядку - найденные пункты вне
+    самой длинной упорядоченной цепочки (longest_ordered).
+    """
+    ordered = longest_ordered(positions)
+    return HeadingMatch(
+        positions=list(positions),
+        missing=[h for h, p in zip(toc, positions) if p is None],
+        out_of_order=[h for i, (h, p) in enumerate(zip(toc, positions)) if p is not None and i not in ordered],
+    )
+
+
+class HeadingIndex:
+    """
+    Хэш-индекс заголовков текста: нормализованный текст -> позиции в порядке следования.
+    Каждый заголовок нормализуется один раз, поиск пункта содержания - одно обращение к dict.
+    """
+
+    def __init__(self, headings: Iterable[str], normalize: Callable[[str], str] = normalize_heading):
+        self.normalize = normalize
+        self.positions: dict[str, list[int]] = {}
+        for i, heading in enumerate(headings):
+            self.positions.setdefault(normalize(heading), []).append(i)
+
+    def match(self, toc: Sequence[str]) -> HeadingMatch:
+        """
+        Сопоставляет пункты содержания заголовкам за один проход. Повторяющиеся пункты
+        («Выводы» в каждой главе) занимают следующие по порядку вхождения заголовка.
+        """
+        cursors: dict[str, Iterator[int]] = {}
+        positions = []
+        for heading in toc:
+            key = self.normalize(heading)
+            if key not in cursors:
+                cursors[key] = iter(self.positions.get(key, ()))
+            positions.append(next(cursors[key], None))
+        return diagnose(toc, positions)
+
+
+def match_headings(toc: Sequence[str], headings: Iterable[str],
+                   normalize: Callable[[str], str] = normalize_heading) -> HeadingMatch:
+    """Проверяет, что все пункты содержания есть среди заголовков и идут в том же порядке."""
+    return HeadingIndex(headings, normalize).match(toc)
@@ -0,0 +1,69 @@
+from enum import Enum
+
+from src.validator.pdf.layout import DocumentLayout, PageLayout
+
+
+class PageKind(Enum):
+    TEXT = "текст"
+    IMAGE = "изображение"
+    MIXED = "смешанная"
+    BLANK = "пустая"
+
+
+# Поток содержимого скана обычно сводится к «q ... cm /Im0 Do Q»
+_SMALL_CONTENT = 512
+# Начиная с такой доли площади под изображениями страница считается смешанной
+_MIXED_COVERAGE = 0.5
+# Смешанные страницы (текст с крупным рисунком) проверяются так же, как текстовые
+CHECKED_KINDS = (PageKind.TEXT, PageKind.MIXED)
+
+
+def classify_page(page: PageLayout) -> PageKind:
+    """
+    Классифицирует страницу до извлечения спанов: по размеру потока содержимого,
+    доле площади под изображениями и числу текстовых блоков.
+    """
+    has_images = page.image_coverage > 0
+    if has_images and page.content_size < _SMALL_CONTENT:
+        return PageKind.IMAGE
+
+    text_blocks = sum(1 for box in page.boxes if box.text.strip())
+    if not text_blocks:
+        return PageKind.IMAGE if has_images else PageKind.BLANK
+    if page.image_coverage >= _MIXED_COVERAGE:
+        return PageKind.MIXED
+    return PageKind.TEXT
+
+
+def classify_pages(layout: DocumentLayout) -> dict[int, PageKind]:
+    return {page.number: classify_page(page) for page in layout}
+
+
+def text_pages(kinds: dict[int, PageKind]) -> list[int]:
+    """Страницы с текстом, которые попадают в проверки: все, кроме изображений и пустых."""
+    return [n for n, kind in kinds.items() if kind in CHECKED_KINDS]
+
+
+def _ranges(pages: list[int]) -> str:
+    """[0, 1, 2, 5] -> «1-3, 6» (нумерация с единицы)."""
+    parts = []
+    start = prev = None
+    for page in pages:
+        if prev is not None and page == prev + 1:
+            prev = page
+            continue
+        if start is not None:
+            parts.append(f"{start + 1}-{prev + 1}" if prev > start else f"{start + 1}")
+        start = prev = page
+    if start is not None:
+        parts.append(f"{start + 1}-{prev + 1}" if prev > start else f"{start + 1}")
+    return ", ".join(parts)
+
+
+def classification_note(kinds: dict[int, PageKind]) -> str:
+    parts = []
+    for kind in PageKind:
+        pages = sorted(n for n, k in kinds.items() if k is kind)
+        if pages:
+            parts.append(f"{kind.value} - {_ranges(pages)}")
+    return "Типы страниц (изображения и пустые не проверяются): " + "; ".join(parts)
@@ -0,0 +1,140 @@
+import numpy as np
+
+from pymupdf import Document
+
+from src.validator.pdf.headings_checker import HEADING_MIN_LEN, HEADING_MIN_SIZE
+from src.validator.pdf.layout import DocumentLayout, as_layout
+from src.validator.pdf.validate_font import FONT_SIZE_RANGE, is_allowed_font, is_heading_text
+from src.validator.pdf.validate_inpage_style import BOTTOM_FIELD, FIELDS_MIN_TEXT, LEFT_BOUND, RIGHT_FIELD, TOP_BOUND
+from src.validator.result import ValidationResult, ErrCause
+
+
+
+class SpanTable:
+    """
+    Колоночное представление разметки документа: одна строка массива на спан, строку и блок.
+    Правила по шрифтам, размерам и полям вычисляются над ним масками NumPy,
+    первая страница с нарушением берётся через argmax.
+
+    Спаны: page, line, x0/y0/x1/y1, font (индекс в fonts), size, text_len, blank, heading.
+    Строки: line_page, line_size (максимальный размер шрифта в строке), line_text.
+    Блоки: block_page, block_x0/y0/x1/y1, block_text_len.
+    Размеры страниц: page_width/page_height, индекс - номер страницы.
+    """
+
+    def __init__(self, doc: Document | DocumentLayout):
+        layout = as_layout(doc)
+        fonts: dict[str, int] = {}
+        page, line, bbox, font, size, text_len, blank, heading = [], [], [], [], [], [], [], []
+        line_page, line_start, line_text = [], [], []
+        block_page, block_bbox, block_text_len = [], [], []
+        self.page_width = np.zeros(len(layout.doc))
+        self.page_height = np.zeros(len(layout.doc))
+
+        for p in layout:
+            self.page_width[p.number] = p.width
+            self.page_height[p.number] = p.height
+            for block in p.text_blocks():
+                lines = block.get("lines", ())
+                block_page.append(p.number)
+                block_bbox.append(block["bbox"])
+                # Длина как у текста блока со строками через \n (см. PageLayout.boxes)
+                chars = max(len(lines) - 1, 0)
+                for ln in lines:
+                    line_page.append(p.number)
+                    line_start.append(len(page))
+                    texts = []
+                    for span in ln["spans"]:
+                        text = span["text"]
+                        stripped = text.strip()
+                        texts.append(text)
+                        chars += len(text)
+                        page.append(p.number)
+                        line.append(len(line_page) - 1)
+                        bbox.append(span["bbox"])
+                        font.append(fonts.setdefault(span["font"], len(fonts)))
+                        size.append(span["size"])
+                        text_len.append(len(stripped))
+                        blank.append(not stripped)
+                        heading.append(is_heading_text(stripped))
+                    line_text.append(" ".join(texts).strip())
+                block_text_len.append(chars)
+
+        self.fonts = list(fonts)
+        self.page = np.array(page, dtype=np.int32)
+        self.line = np.array(line, dtype=np.int32)
+        self.x0, self.y0, self.x1, self.y1 = np.array(bbox, dtype=np.float64).reshape(-1, 4).T
+        self.font = np.array(font, dtype=np.int32)
+        self.size = np.array(size, dtype=np.float64)
+        self.text_len = np.array(text_len, dtype=np.int32)
+        self.blank = np.array(blank, dtype=bool)
+        self.heading = np.array(heading, dtype=bool)
+
+        self.line_page = np.array(line_page, dtype=np.int32)
+        self.line_size = np.maximum.reduceat(self.size, line_start) if line_start else np.zeros(0)
+        self.line_text = line_text
+
+        self.block_page = np.array(block_page, dtype=np.int32)
+        self.block_x0, self.block_y0, self.block_x1, self.block_y1 = \
+            np.array(block_bbox, dtype=np.float64).reshape(-1, 4).T
+        self.block_text_len = np.array(block_text_len, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.page)
+
+    def allowed_fonts(self) -> np.ndarray:
+        """Маска разрешённых шрифтов: одна проверка на уникальный шрифт, а не на спан."""
+        return np.array([is_allowed_font(name) for name in self.fonts], dtype=bool)
+
+    def heading_lines(self) -> list[tuple[int, str]]:
+        """Строки-кандидаты в заголовки: (номер страницы, текст)."""
+        text_len = np.fromiter((len(text) for text in self.line_text), dtype=np.int32, count=len(self.line_text))
+        mask = (self.line_size >= HEADING_MIN_SIZE) & (text_len > HEADING_MIN_LEN)
+        return [(int(self.line_page[i]), self.line_text[i]) for i in np.flatnonzero(mask)]
+
+
+def _first(mask: np.ndarray) -> int | None:
+    if not mask.any():
+        return None
+    return int(mask.argmax())
+
+
+def first_font_violation(t: SpanTable) -> int | None:
+    """Индекс первого спана с неразрешённым шрифтом."""
+    return _first(~t.blank & ~t.allowed_fonts()[t.font])
+
+
+def first_size_violation(t: SpanTable) -> int | None:
+    """Индекс первого незаголовочного спана с размером вне диапазона."""
+    low, high = FONT_SIZE_RANGE
+    return _first(~t.blank & ~t.heading & ~((t.size > low) & (t.size < high)))
+
+
+def first_fields_violation(t: SpanTable) -> int | None:
+    """Индекс первого длинного блока, выходящего за поля страницы."""
+    width = t.page_width[t.block_page]
+    height = t.page_height[t.block_page]
+    outside = (t.block_x0 < LEFT_BOUND) | (t.block_x1 > width - RIGHT_FIELD) | \
+              (t.block_y0 < TOP_BOUND) | (t.block_y1 > height - BOTTOM_FIELD)
+    return _first((t.block_text_len > FIELDS_MIN_TEXT) & outside)
+
+
+def validate_columnar(t: SpanTable, r: ValidationResult):
+    """
+    Проверки шрифта, размера шрифта и полей над колоночной таблицей. Сообщения совпадают
+    с validate_font и validate_inpage_stype.
+    """
+    if not r.has_err(ErrCause.INVALID_FONT):
+        i = first_font_violation(t)
+        if i is not None:
+            r.add_err(ErrCause.INVALID_FONT,
+                      f"На странице {t.page[i] + 1} используется шрифт {t.fonts[t.font[i]]}")
+    if not r.has_err(ErrCause.INVALID_FONT_SIZE):
+        i = first_size_violation(t)
+        if i is not None:
+            r.add_err(ErrCause.INVALID_FONT_SIZE,
+                      f"На странице {t.page[i] + 1} размер шрифта {t.size[i]}pt вне диапазона 12-14pt.")
+    if not r.has_err(ErrCause.INVALID_PAGE_FIELDS):
+        i = first_fields_violation(t)
+        if i is not None:
+            r.add_err(ErrCause.INVALID_PAGE_FIELDS, f"некорректные поля на странице {t.block_page[i] + 1}")
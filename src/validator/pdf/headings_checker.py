@@ -1,50 +1,161 @@
-import fitz  # PyMuPDF
+import pymupdf
 import re
+from collections import Counter
+from typing import Iterator
 
+from src.validator.heading_match import diagnose, normalize_heading
+from src.validator.pdf.layout import DocumentLayout, PageLayout, as_layout
+from src.validator.text_search import AhoCorasick
 
-def extract_and_check_headings_from_pdf(pdf_path: str):
-    doc = fitz.open(pdf_path)
+# Отточие и номер страницы в конце пункта содержания: «Введение . . . . 4»
+_LEADER = re.compile(r"(?:\s*\.)+\s*\d*\s*$")
+# Строки-кандидаты в заголовки: шрифт не меньше 12pt и больше 5 символов
+HEADING_MIN_SIZE = 12
+HEADING_MIN_LEN = 5
 
-    toc_page_index = None
-    for i, page in enumerate(doc):
-        text = page.get_text("text")
-        if "СОДЕРЖАНИЕ" in text.upper():
-            toc_page_index = i
+
+def _clean(line: str) -> str:
+    return _LEADER.sub("", line).strip()
+
+
+def _heading_lines(page: PageLayout) -> list[str]:
+    """Строки страницы, набранные шрифтом не меньше 12pt, - кандидаты в заголовки."""
+    headings = []
+    for line in page.lines():
+        text = " ".join([span["text"] for span in line["spans"]]).strip()
+        fontsize = max(span["size"] for span in line["spans"])
+        if fontsize >= HEADING_MIN_SIZE and len(text) > HEADING_MIN_LEN:
+            headings.append(text)
+    return headings
+
+
+def _outline_targets(doc: pymupdf.Document) -> list[tuple[str, int]]:
+    """
+    Пункты оглавления (outline) PDF и номера целевых страниц (с нуля, -1 - неизвестно).
+    Именованные назначения, которые get_toc не разрешил, ищем через resolve_names.
+    """
+    toc = doc.get_toc(simple=False)
+    if not toc:
+        return []
+    names = None
+    targets = []
+    for _, title, page, dest in toc:
+        page -= 1
+        if page < 0 and dest.get("nameddest"):
+            if names is None:
+                names = doc.resolve_names()
+            page = names.get(dest["nameddest"], {}).get("page", -1)
+        targets.append((title.strip(), page))
+    return targets
+
+
+def _candidate_lines(layout: DocumentLayout, start: int) -> Iterator[tuple[int, list[str]]]:
+    """Строки-кандидаты в заголовки по страницам разметки, начиная со страницы start."""
+    for page_num in layout.pages:
+        if page_num >= start:
+            yield page_num, _heading_lines(layout.page(page_num))
+
+
+def _table_lines(table, start: int) -> Iterator[tuple[int, list[str]]]:
+    for page_num, line in table.heading_lines():
+        if page_num >= start:
+            yield page_num, [line]
+
+
+def _find_in_document(layout: DocumentLayout, headings: list[str], table=None, start: int = 0) -> list[int | None]:
+    """
+    Страница каждого заголовка в строках-кандидатах документа (начиная со страницы start),
+    None - не найден. Все заголовки ищутся одновременно автоматом Ахо-Корасик; обход
+    прекращается, когда найдено достаточно вхождений каждого. Как в HeadingIndex.match,
+    повторяющиеся пункты («Выводы» в каждой главе) занимают следующие по порядку вхождения.
+    Если передана колоночная таблица (columnar.SpanTable), кандидаты берутся из неё.
+    """
+    keys = [normalize_heading(h) for h in headings]
+    needed = Counter(keys)
+    automaton = AhoCorasick(needed)
+    occurrences: list[list[int]] = [[] for _ in automaton.patterns]
+    pages = _candidate_lines(layout, start) if table is None else _table_lines(table, start)
+    for page_num, lines in pages:
+        for line in lines:
+            for i in automaton.search(normalize_heading(line)):
+                occurrences[i].append(page_num)
+        if all(len(found) >= needed[key] for key, found in zip(automaton.patterns, occurrences)):
             break
 
-    if toc_page_index is None:
-        return {
-            "status": "failed",
-            "reason": "Не найдена страница с содержанием (СОДЕРЖАНИЕ)",
-            "missing_headings": []
-        }
+    cursors = {key: iter(found) for key, found in zip(automaton.patterns, occurrences)}
+    return [next(cursors[key], None) for key in keys]
 
-    toc_page_text = doc[toc_page_index].get_text("text")
-
-    toc_lines = [line.strip() for line in toc_page_text.split("\n") if "." in line and len(line.strip()) > 5]
-    toc_headings = [re.sub(r"\.+\s*\d+$", "", line).strip() for line in toc_lines]
-    all_headings = set()
-    for page in doc:
-        blocks = page.get_text("dict")["blocks"]
-        for block in blocks:
-            if "lines" in block:
-                for line in block["lines"]:
-                    text = " ".join([span["text"] for span in line["spans"]]).strip()
-                    fontsize = max(span["size"] for span in line["spans"])
-                    if fontsize >= 12 and len(text) > 5:
-                        all_headings.add(text)
-
-    heading_presence = {h: any(h in heading for heading in all_headings) for h in toc_headings}
-    missing = [h for h, present in heading_presence.items() if not present]
-    print(missing)
-    if not missing:
-        return {
-            "status": "passed",
-            "message": "Все заголовки из содержания найдены в тексте документа."
-        }
+
+def _outline_positions(layout: DocumentLayout, targets: list[tuple[str, int]], table=None) -> list[int | None]:
+    """
+    Проверяет каждый пункт outline только на его целевой странице.
+    Возвращает страницу каждого пункта (None - не найден) для проверки порядка.
+    """
+    positions: list[int | None] = []
+    unresolved = []
+    page_texts: dict[int, str] = {}
+    for i, (title, page_num) in enumerate(targets):
+        positions.append(None)
+        if page_num not in layout.pages:
+            unresolved.append(i)
+            continue
+        if page_num not in page_texts:
+            # Заголовок может переноситься на несколько строк, поэтому склеиваем их
+            page_texts[page_num] = normalize_heading(" ".join(_heading_lines(layout.page(page_num))))
+        if normalize_heading(title) in page_texts[page_num]:
+            positions[i] = page_num
+
+    if unresolved:
+        found = _find_in_document(layout, [targets[i][0] for i in unresolved], table)
+        for i, page_num in zip(unresolved, found):
+            positions[i] = page_num
+    return positions
+
+
+def extract_and_check_headings_from_pdf(pdf: str | pymupdf.Document | DocumentLayout, table=None):
+    layout = as_layout(pymupdf.open(pdf) if isinstance(pdf, str) else pdf)
+
+    # Быстрый путь: у PDF есть outline с целевыми страницами пунктов
+    targets = _outline_targets(layout.doc)
+    if targets:
+        match = diagnose([title for title, _ in targets], _outline_positions(layout, targets, table))
     else:
+        toc_page_index = None
+        for page in layout:
+            if "СОДЕРЖАНИЕ" in page.text.upper():
+                toc_page_index = page.number
+                break
+
+        if toc_page_index is None:
+            return {
+                "status": "failed",
+                "reason": "Не найдена страница с содержанием (СОДЕРЖАНИЕ)",
+                "missing_headings": []
+            }
+
+        toc_page_text = layout.page(toc_page_index).text
+
+        toc_lines = [line.strip() for line in toc_page_text.split("\n") if "." in line and len(line.strip()) > 5]
+        toc_headings = [_clean(line) for line in toc_lines]
+        # Заголовки ищутся после страницы содержания, иначе пункты находятся в нём самом
+        found = _find_in_document(layout, toc_headings, table, start=toc_page_index + 1)
+        match = diagnose(toc_headings, found)
+
+    # Позиции пунктов - номера страниц: несколько пунктов на одной странице не нарушают порядок
+    if match.missing:
         return {
             "status": "failed",
             "reason": "Некоторые заголовки из содержания не найдены в тексте.",
-            "missing_headings": missing
-        }
\ No newline at end of file
+            "missing_headings": match.missing
+        }
+    if match.out_of_order:
+        return {
+            "status": "failed",
+            "reason": "Заголовки в тексте идут не в том порядке, что в содержании.",
+            "missing_headings": [],
+            "out_of_order_headings": match.out_of_order
+        }
+    return {
+        "status": "passed",
+        "message": "Все заголовки из содержания найдены в тексте документа."
+    }
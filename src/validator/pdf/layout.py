@@ -0,0 +1,181 @@
+import re
+from typing import Iterable, Iterator, NamedTuple
+
+from pymupdf import Document, Page, Rect, TextPage, TEXTFLAGS_DICT, TEXT_PRESERVE_IMAGES
+
+from src.validator.pdf.spans import Block, Line, line_text
+
+# Байты изображений ни одной проверке не нужны, поэтому не сохраняем их в модели
+_DICT_FLAGS = TEXTFLAGS_DICT & ~TEXT_PRESERVE_IMAGES
+# Префикс подмножества встроенного шрифта: «GJFWTF+TimesNewRomanPSMT»
+_SUBSET_PREFIX = re.compile(r"^[A-Z]{6}\+")
+
+
+def normalize_font_name(name: str) -> str:
+    return _SUBSET_PREFIX.sub("", name).lower().replace(" ", "")
+
+
+class BlockBox(NamedTuple):
+    """Текстовый блок без детализации по спанам: bbox и текст (строки через \\n)."""
+    bbox: tuple[float, float, float, float]
+    text: str
+
+
+class PageLayout:
+    """
+    Разметка одной страницы PDF. Представления извлекаются лениво и кэшируются:
+      - blocks - блоки, строки и спаны (bbox, шрифт, размер, текст) в формате page.get_text("dict");
+      - boxes - только bbox и текст блоков, без спанов;
+      - region(clip) - спаны в заданной полосе страницы;
+      - fonts - нормализованные имена шрифтов из ресурсов страницы;
+      - image_coverage, content_size - дешёвые признаки для классификации страницы.
+    Если полная разметка уже извлечена, остальные представления строятся из неё.
+    """
+    number: int
+    width: float
+    height: float
+
+    def __init__(self, page: Page, font_names: dict[int, str] | None = None):
+        self.number = page.number
+        self.width = page.rect.width
+        self.height = page.rect.height
+        self._page = page
+        self._textpage: TextPage | None = None
+        self._blocks: list[Block] | None = None
+        self._boxes: list[BlockBox] | None = None
+        self._fonts: set[str] | None = None
+        self._image_coverage: float | None = None
+        # Общий для документа кэш: xref шрифта -> нормализованное имя
+        self._font_names = {} if font_names is None else font_names
+
+    def __textpage(self) -> TextPage:
+        if self._textpage is None:
+            self._textpage = self._page.get_textpage(flags=_DICT_FLAGS)
+        return self._textpage
+
+    @property
+    def blocks(self) -> list[Block]:
+        if self._blocks is None:
+            self._blocks = self._page.get_text("dict", textpage=self.__textpage())["blocks"]
+        return self._blocks
+
+    @property
+    def boxes(self) -> list[BlockBox]:
+        if self._boxes is None:
+            if self._blocks is not None:
+                self._boxes = [BlockBox(block["bbox"], "\n".join(line_text(line) for line in block.get("lines", ())))
+                               for block in self.text_blocks()]
+            else:
+                self._boxes = [BlockBox((x0, y0, x1, y1), text.rstrip("\n"))
+                               for x0, y0, x1, y1, text, _, block_type
+                               in self._page.get_text("blocks", textpage=self.__textpage())
+                               if block_type == 0]
+        return self._boxes
+
+    @property
+    def fonts(self) -> set[str]:
+        """Шрифты из таблицы ресурсов страницы; спаны для этого не извлекаются."""
+        if self._fonts is None:
+            fonts = set()
+            for xref, _, _, basefont, *_ in self._page.get_fonts():
+                name = self._font_names.get(xref)
+                if name is None:
+                    name = self._font_names[xref] = normalize_font_name(basefont)
+                fonts.add(name)
+            self._fonts = fonts
+        return self._fonts
+
+    @property
+    def image_coverage(self) -> float:
+        """Доля площади страницы, занятая изображениями."""
+        if self._image_coverage is None:
+            area = self.width * self.height
+            if not area or not self._page.get_images():
+                self._image_coverage = 0.0
+            else:
+                page_rect = self._page.rect
+                covered = sum(abs(Rect(info["bbox"]) & page_rect) for info in self._page.get_image_info())
+                self._image_coverage = min(covered / area, 1.0)
+        return self._image_coverage
+
+    @property
+    def content_size(self) -> int:
+        """Размер потока содержимого страницы в байтах (после распаковки)."""
+        return len(self._page.read_contents())
+
+    def release(self):
+        """
+        Освобождает страницу MuPDF и все извлечённые представления. После вызова
+        доступны только number, width и height.
+        """
+        self._page = None
+        self._textpage = None
+        self._blocks = None
+        self._boxes = None
+        self._fonts = None
+
+    def region(self, clip: Rect) -> list[Block]:
+        """
+        Блоки со спанами, попадающие в полосу clip. Без полной разметки извлекается только
+        сама полоса; иначе возвращаются все блоки - отбор по bbox остаётся за вызывающим.
+        """
+        if self._blocks is not None:
+            return self._blocks
+        return self._page.get_text("dict", clip=clip, flags=_DICT_FLAGS)["blocks"]
+
+    def text_blocks(self) -> Iterator[Block]:
+        for block in self.blocks:
+            if block["type"] == 0:
+                yield block
+
+    def lines(self) -> Iterator[Line]:
+        for block in self.text_blocks():
+            yield from block.get("lines", [])
+
+    @property
+    def text(self) -> str:
+        """Текст страницы построчно - аналог page.get_text("text")."""
+        return "".join(box.text + "\n" for box in self.boxes)
+
+
+class DocumentLayout:
+    """
+    Модель разметки всего документа. Каждое представление страницы извлекается из MuPDF
+    не более одного раза (при первом обращении), после чего все валидаторы читают его из кэша.
+
+    pages ограничивает обход подмножеством страниц (по возрастанию номеров),
+    номера страниц при этом остаются абсолютными.
+    """
+
+    def __init__(self, doc: Document, pages: Iterable[int] | None = None):
+        self.doc = doc
+        self.pages = range(len(doc)) if pages is None else sorted(pages)
+        self._cache: dict[int, PageLayout] = {}
+        self._font_names: dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def __iter__(self) -> Iterator[PageLayout]:
+        for page_num in self.pages:
+            yield self.page(page_num)
+
+    def subset(self, pages: Iterable[int]) -> "DocumentLayout":
+        """Разметка части страниц с общим кэшем: уже извлечённое повторно не извлекается."""
+        layout = DocumentLayout(self.doc, pages)
+        layout._cache = self._cache
+        layout._font_names = self._font_names
+        return layout
+
+    def page(self, page_num: int) -> PageLayout:
+        layout = self._cache.get(page_num)
+        if layout is None:
+            layout = PageLayout(self.doc[page_num], self._font_names)
+            self._cache[page_num] = layout
+        return layout
+
+
+def as_layout(doc: Document | DocumentLayout) -> DocumentLayout:
+    if isinstance(doc, DocumentLayout):
+        return doc
+    return DocumentLayout(doc)
@@ -1,18 +1,49 @@
 from pymupdf import Document, open
 
+from src.validator.pdf.classify import classification_note, classify_pages, text_pages
+from src.validator.pdf.columnar import SpanTable, validate_columnar
+from src.validator.pdf.layout import DocumentLayout
+from src.validator.pdf.sampling import PageSelection, coverage_note
 from src.validator.pdf.validate_font import validate_font
 from src.validator.pdf.validate_headers import validate_headings_order
 from src.validator.pdf.validate_inpage_style import validate_inpage_stype
 from src.validator.result import ValidationResult
+from src.validator.source import Source, as_buffer, is_path
 
 
-def open_pdf(fielpath: str) -> Document:
-    return open(fielpath)
+def open_pdf(fielpath: Source) -> Document:
+    """
+    Открывает PDF по пути или из памяти (bytes, memoryview, mmap, бинарный поток).
+    Буферы передаются в MuPDF без копирования; mmap нельзя закрывать, пока открыт документ.
+    """
+    if is_path(fielpath):
+        return open(fielpath)
+    return open(stream=as_buffer(fielpath), filetype="pdf")
 
-def validate_pdf(doc: Document) -> ValidationResult:
+def validate_pdf(doc: Document, pages: PageSelection | None = None, columnar: bool = False) -> ValidationResult:
+    """
+    Проверяет PDF. pages задаёт стратегию выбора страниц для быстрой предварительной
+    проверки; достигнутое покрытие записывается в лог результата.
+    columnar=True строит колоночную таблицу спанов и проверяет шрифты, размеры и поля
+    векторно по всему документу (без раннего выхода после первых нарушений).
+    Страницы без текста (сканы, полностраничные рисунки) в проверки не попадают;
+    их классификация записывается в лог. На них нет текстовых заголовков, поэтому
+    отсутствие обязательных секций не проверяется только при выборке страниц (pages).
+    """
     r = ValidationResult.empty()
-    validate_font(doc, r)
-    validate_inpage_stype(doc, r)
-    validate_headings_order(doc, r)
+    # Каждая страница извлекается один раз и переиспользуется всеми проверками
+    selected = DocumentLayout(doc, pages.select(len(doc)) if pages is not None else None)
+    kinds = classify_pages(selected)
+    layout = selected.subset(text_pages(kinds))
+    if columnar:
+        validate_columnar(SpanTable(layout), r)
+    else:
+        validate_font(layout, r)
+    validate_inpage_stype(layout, r)
+    validate_headings_order(layout, r, complete=pages is None)
+    if pages is not None:
+        r.log.append(coverage_note(len(selected), len(doc)))
+    if len(layout) < len(selected):
+        r.log.append(classification_note(kinds))
 
     return r
\ No newline at end of file
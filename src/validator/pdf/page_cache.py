@@ -0,0 +1,150 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+from pymupdf import Document, Page
+
+from src.validator.pdf.classify import CHECKED_KINDS, PageKind, classification_note, classify_page
+from src.validator.pdf.layout import PageLayout
+from src.validator.pdf.span_rules import evaluate_page_span_rules
+from src.validator.pdf.validate_font import FONT_RULES
+from src.validator.pdf.validate_headers import check_headings_order, page_heading
+from src.validator.pdf.validate_inpage_style import validate_page_style
+from src.validator.result import ValidationResult, ErrCause
+
+# Меняется вместе с правилами проверки страниц, чтобы старые записи кэша не использовались
+CACHE_VERSION = 2
+
+
+class PageSummary(NamedTuple):
+    """Всё, что проверки документа берут со страницы: тип, нарушения и заголовок."""
+    kind: PageKind
+    errors: dict[ErrCause, str]
+    heading: str
+
+
+def page_fingerprint(page: Page) -> str:
+    """
+    Отпечаток страницы: поток содержимого, формы (Form XObject), шрифты и изображения
+    из ресурсов, размер, поворот и номер страницы (от номера зависят проверка нумерации
+    и тексты сообщений). Номера xref не учитываются - при пересборке PDF они меняются.
+    """
+    doc = page.parent
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((CACHE_VERSION, page.number, tuple(page.rect), page.rotation)).encode())
+    h.update(page.read_contents())
+    for _, ext, font_type, basefont, name, encoding, *_ in page.get_fonts():
+        h.update(repr((name, basefont, font_type, ext, encoding)).encode())
+    for _, _, width, height, bpc, colorspace, _, name, *_ in page.get_images():
+        h.update(repr((name, width, height, bpc, colorspace)).encode())
+    for xref, name, *_ in page.get_xobjects():
+        h.update(name.encode())
+        h.update(doc.xref_stream(xref) or b"")
+    return h.hexdigest()
+
+
+def summarize_page(page: PageLayout) -> PageSummary:
+    """Проверяет одну страницу независимо от остальных: первое нарушение каждой причины."""
+    kind = classify_page(page)
+    if kind not in CHECKED_KINDS:
+        return PageSummary(kind, {}, "")
+    r = ValidationResult.empty()
+    evaluate_page_span_rules(page, FONT_RULES, r)
+    validate_page_style(page, r)
+    return PageSummary(kind, r.errors, page_heading(page))
+
+
+def merge_page_summaries(summaries: Iterable[PageSummary]) -> ValidationResult:
+    """
+    Собирает результат документа из сводок страниц в порядке страниц: сообщение каждой
+    причины берётся с первой страницы, где она встретилась, порядок секций проверяется
+    по заголовкам проверенных страниц.
+    """
+    r = ValidationResult.empty()
+    kinds: dict[int, PageKind] = {}
+    headings: list[str] = []
+    for page_num, summary in enumerate(summaries):
+        kinds[page_num] = summary.kind
+        for cause, description in summary.errors.items():
+            if not r.has_err(cause):
+                r.add_err(cause, description)
+        if summary.kind in CHECKED_KINDS:
+            headings.append(summary.heading)
+    check_headings_order(headings, r)
+    if len(headings) < len(kinds):
+        r.log.append(classification_note(kinds))
+    return r
+
+
+class PageCache:
+    """
+    Кэш сводок страниц по отпечатку. Переживает перезапуск через save/load (JSON),
+    так что при повторной сдаче работы извлекаются и проверяются только изменённые страницы.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, PageSummary] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, fingerprint: str) -> PageSummary | None:
+        return self._entries.get(fingerprint)
+
+    def put(self, fingerprint: str, summary: PageSummary):
+        self._entries[fingerprint] = summary
+
+    def save(self, path: str | Path):
+        entries = {
+            fingerprint: {
+                "kind": summary.kind.name,
+                "errors": {cause.name: description for cause, description in summary.errors.items()},
+                "heading": summary.heading,
+            }
+            for fingerprint, summary in self._entries.items()
+        }
+        Path(path).write_text(json.dumps({"version": CACHE_VERSION, "pages": entries}, ensure_ascii=False),
+                              encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: str | Path) -> "PageCache":
+        """Загружает кэш; отсутствующий файл или кэш другой версии дают пустой кэш."""
+        cache = cls()
+        path = Path(path)
+        if not path.exists():
+            return cache
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data.get("version") != CACHE_VERSION:
+            return cache
+        for fingerprint, entry in data["pages"].items():
+            cache.put(fingerprint, PageSummary(
+                PageKind[entry["kind"]],
+                {ErrCause[cause]: description for cause, description in entry["errors"].items()},
+                entry["heading"],
+            ))
+        return cache
+
+
+def validate_pdf_cached(doc: Document, cache: PageCache) -> ValidationResult:
+    """
+    Проверяет PDF, переиспользуя сводки неизменённых страниц из cache. Разметка
+    извлекается только для страниц с новым отпечатком; их сводки добавляются в кэш.
+    Ошибки совпадают с validate_pdf.
+    """
+    summaries = []
+    font_names: dict[int, str] = {}
+    checked = 0
+    for page_num in range(len(doc)):
+        page = doc[page_num]
+        fingerprint = page_fingerprint(page)
+        summary = cache.get(fingerprint)
+        if summary is None:
+            summary = summarize_page(PageLayout(page, font_names))
+            cache.put(fingerprint, summary)
+            checked += 1
+        summaries.append(summary)
+
+    r = merge_page_summaries(summaries)
+    r.log.append(f"Перепроверено страниц: {checked} из {len(doc)}")
+    return r
@@ -0,0 +1,83 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Iterable
+
+from pymupdf import open
+
+from src.validator.pdf.classify import PageKind, classification_note, classify_pages, text_pages
+from src.validator.pdf.layout import DocumentLayout
+from src.validator.pdf.open_doc import validate_pdf
+from src.validator.pdf.validate_font import validate_font
+from src.validator.pdf.validate_headers import check_headings_order, page_heading
+from src.validator.pdf.validate_inpage_style import validate_inpage_stype
+from src.validator.result import ValidationResult
+
+# Меньшие диапазоны не окупают открытие документа в отдельном процессе
+PAGES_PER_RANGE = 25
+
+
+def split_page_ranges(page_count: int, pages_per_range: int = PAGES_PER_RANGE) -> list[range]:
+    return [range(start, min(start + pages_per_range, page_count))
+            for start in range(0, page_count, pages_per_range)]
+
+
+RangeResult = tuple[ValidationResult, list[str], dict[int, PageKind]]
+
+
+def _validate_range(path: str, pages: range) -> RangeResult:
+    """
+    Выполняется в рабочем процессе: открывает собственный экземпляр документа,
+    проверяет текстовые страницы диапазона и возвращает результат вместе с заголовками страниц,
+    по которым затем проверяется порядок секций во всём документе, и типами страниц.
+    """
+    with open(path) as doc:
+        selected = DocumentLayout(doc, pages)
+        kinds = classify_pages(selected)
+        layout = selected.subset(text_pages(kinds))
+        r = ValidationResult.empty()
+        validate_font(layout, r)
+        validate_inpage_stype(layout, r)
+        headings = [page_heading(page) for page in layout]
+    return r, headings, kinds
+
+
+def merge_range_results(parts: Iterable[RangeResult]) -> ValidationResult:
+    """
+    Объединяет результаты диапазонов в порядке страниц. Для каждой причины сохраняется
+    сообщение из первого диапазона, где она встретилась, - так же, как при последовательной проверке.
+    """
+    r = ValidationResult.empty()
+    headings: list[str] = []
+    kinds: dict[int, PageKind] = {}
+    for part, part_headings, part_kinds in parts:
+        for cause, description in part.errors.items():
+            if not r.has_err(cause):
+                r.add_err(cause, description)
+        for cause, description in part.warnings.items():
+            if cause not in r.warnings:
+                r.add_warn(cause, description)
+        r.log.extend(part.log)
+        headings.extend(part_headings)
+        kinds.update(part_kinds)
+    check_headings_order(headings, r)
+    if len(text_pages(kinds)) < len(kinds):
+        r.log.append(classification_note(kinds))
+    return r
+
+
+def validate_pdf_parallel(path: str, workers: int | None = None,
+                          pages_per_range: int = PAGES_PER_RANGE) -> ValidationResult:
+    """
+    Параллельная проверка PDF: документ делится на диапазоны страниц, которые
+    проверяются в пуле процессов. Результат совпадает с validate_pdf.
+    """
+    workers = workers or os.cpu_count() or 1
+    with open(path) as doc:
+        ranges = split_page_ranges(len(doc), pages_per_range)
+        if workers == 1 or len(ranges) <= 1:
+            return validate_pdf(doc)
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+        # map сохраняет порядок диапазонов, поэтому слияние детерминировано
+        return merge_range_results(pool.map(_validate_range, repeat(path), ranges))
@@ -0,0 +1,59 @@
+import random
+from abc import ABC, abstractmethod
+
+
+class PageSelection(ABC):
+    """Стратегия выбора страниц для проверки. select возвращает номера страниц (с нуля)."""
+
+    @abstractmethod
+    def select(self, page_count: int) -> list[int]:
+        ...
+
+
+class PageRanges(PageSelection):
+    """
+    Явные диапазоны страниц, нумерация с единицы, границы включительно.
+    Например, PageRanges((2, 120)) пропускает титульный лист и всё после 120-й страницы.
+    """
+
+    def __init__(self, *ranges: tuple[int, int]):
+        self.ranges = ranges
+
+    def select(self, page_count: int) -> list[int]:
+        pages = set()
+        for first, last in self.ranges:
+            pages.update(range(max(first, 1) - 1, min(last, page_count)))
+        return sorted(pages)
+
+
+class StratifiedSample(PageSelection):
+    """
+    Случайная выборка: документ делится на size равных частей, из каждой берётся
+    одна страница. Фиксированный seed делает выборку воспроизводимой.
+    """
+
+    def __init__(self, size: int, seed: int = 0):
+        self.size = size
+        self.seed = seed
+
+    def select(self, page_count: int) -> list[int]:
+        if self.size >= page_count:
+            return list(range(page_count))
+        rnd = random.Random(self.seed)
+        bounds = [page_count * i // self.size for i in range(self.size + 1)]
+        return [rnd.randrange(start, stop) for start, stop in zip(bounds, bounds[1:])]
+
+
+class HeadTail(PageSelection):
+    """Первые n и последние n страниц."""
+
+    def __init__(self, n: int):
+        self.n = n
+
+    def select(self, page_count: int) -> list[int]:
+        return sorted(set(range(min(self.n, page_count))) | set(range(max(page_count - self.n, 0), page_count)))
+
+
+def coverage_note(checked: int, total: int) -> str:
+    percent = 100 * checked / total if total else 100
+    return f"Проверено страниц: {checked} из {total} ({percent:.0f}%)"
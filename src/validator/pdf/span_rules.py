@@ -0,0 +1,62 @@
+from abc import ABC, abstractmethod
+from typing import Iterable
+
+from pymupdf import Document
+
+from src.validator.pdf.layout import DocumentLayout, PageLayout, as_layout
+from src.validator.pdf.spans import Span, iter_spans
+from src.validator.result import ValidationResult, ErrCause
+
+
+class SpanRule(ABC):
+    """
+    Правило уровня спана. check возвращает описание нарушения или None.
+    applies_to позволяет отсеять страницу по дешёвым признакам до извлечения спанов.
+    """
+    cause: ErrCause
+
+    def applies_to(self, page: PageLayout) -> bool:
+        return True
+
+    @abstractmethod
+    def check(self, span: Span, text: str, page_num: int) -> str | None:
+        ...
+
+
+def evaluate_page_span_rules(page: PageLayout, rules: Iterable[SpanRule], r: ValidationResult):
+    """Выполняет ещё не насыщенные правила на одной странице (см. evaluate_span_rules)."""
+    page_rules = [rule for rule in rules if not r.has_err(rule.cause) and rule.applies_to(page)]
+    if not page_rules:
+        return
+    for block in page.text_blocks():
+        for span in iter_spans(block):
+            text = span["text"].strip()
+            if not text:
+                continue
+            saturated = False
+            for rule in page_rules:
+                description = rule.check(span, text, page.number)
+                if description is not None:
+                    r.add_err(rule.cause, description)
+                    saturated = True
+            if saturated:
+                page_rules = [rule for rule in page_rules if not r.has_err(rule.cause)]
+                if not page_rules:
+                    return
+
+
+def evaluate_span_rules(doc: Document | DocumentLayout, rules: Iterable[SpanRule], r: ValidationResult):
+    """
+    Выполняет все правила уровня спана за один проход по документу.
+
+    В отчёт попадает первое нарушение каждой причины, поэтому правило считается насыщенным,
+    как только его причина записана в r: дальнейшие нарушения отчёт уже не изменят.
+    Когда насыщены все правила, оставшиеся страницы не извлекаются; страницы, которые
+    отсеяны всеми активными правилами (applies_to), тоже.
+    """
+    rules = list(rules)
+    layout = as_layout(doc)
+    for page_num in layout.pages:
+        if all(r.has_err(rule.cause) for rule in rules):
+            return
+        evaluate_page_span_rules(layout.page(page_num), rules, r)
@@ -0,0 +1,59 @@
+"""
+Типизированный доступ к блокам page.get_text("dict") без сериализации в строку.
+
+Функции читают нужные поля напрямую и не создают промежуточных копий блока,
+поэтому их можно вызывать для каждого блока каждой страницы.
+"""
+import re
+from typing import Iterator, TypedDict
+
+_NUMBER = re.compile(r"[+-]?\d+")
+
+
+class Span(TypedDict):
+    text: str
+    font: str
+    size: float
+    bbox: tuple[float, float, float, float]
+
+
+class Line(TypedDict):
+    spans: list[Span]
+    bbox: tuple[float, float, float, float]
+
+
+class Block(TypedDict, total=False):
+    type: int
+    bbox: tuple[float, float, float, float]
+    lines: list[Line]
+
+
+def iter_spans(block: Block) -> Iterator[Span]:
+    for line in block.get("lines", ()):
+        yield from line["spans"]
+
+
+def line_text(line: Line) -> str:
+    return "".join(span["text"] for span in line["spans"])
+
+
+def first_line_text(block: Block) -> str:
+    """Текст первой непустой строки блока."""
+    for line in block.get("lines", ()):
+        text = line_text(line).strip()
+        if text:
+            return text
+    return ""
+
+
+def text_length(block: Block) -> int:
+    return sum(len(span["text"]) for span in iter_spans(block))
+
+
+def page_number_candidate(block: Block) -> int:
+    """Первое целое число среди спанов блока (номер страницы) или 0."""
+    for span in iter_spans(block):
+        text = span["text"].strip()
+        if _NUMBER.fullmatch(text):
+            return int(text)
+    return 0
@@ -0,0 +1,78 @@
+import gc
+import os
+
+import pymupdf
+from pymupdf import Document
+
+from src.validator.pdf.classify import CHECKED_KINDS, PageKind, classification_note, classify_page
+from src.validator.pdf.layout import PageLayout
+from src.validator.pdf.span_rules import evaluate_page_span_rules
+from src.validator.pdf.validate_font import FONT_RULES
+from src.validator.pdf.validate_headers import check_headings_order, page_heading
+from src.validator.pdf.validate_inpage_style import validate_page_style
+from src.validator.result import ValidationResult
+
+# Через сколько страниц очищать хранилище MuPDF (шрифты, изображения, display lists)
+SHRINK_EVERY = 16
+# Мягкий лимит резидентной памяти процесса: при превышении хранилище очищается сразу
+RSS_BUDGET = 512 * 1024 * 1024
+
+
+def current_rss() -> int | None:
+    """Текущий RSS процесса в байтах; None, если платформа не даёт его узнать (не Linux)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _shrink_store():
+    gc.collect()
+    pymupdf.TOOLS.store_shrink(100)
+
+
+def validate_pdf_streaming(doc: Document, shrink_every: int = SHRINK_EVERY,
+                           rss_budget: int | None = RSS_BUDGET) -> ValidationResult:
+    """
+    Потоковая проверка PDF с ограниченной памятью. Страницы обрабатываются по одной:
+    все проверки выполняются сразу, после чего страница и её разметка освобождаются.
+    От страницы остаются только её тип и заголовок для проверки порядка секций.
+
+    Каждые shrink_every страниц хранилище MuPDF очищается; при RSS выше rss_budget
+    (в байтах, None - без лимита) - ещё и немедленно. Лимит мягкий: если очистка
+    не помогла, проверка продолжается, а превышение отмечается в логе.
+    Ошибки совпадают с validate_pdf.
+    """
+    r = ValidationResult.empty()
+    kinds: dict[int, PageKind] = {}
+    headings: list[str] = []
+    font_names: dict[int, str] = {}
+    over_budget = False
+
+    for page_num in range(len(doc)):
+        page = PageLayout(doc[page_num], font_names)
+        kinds[page_num] = classify_page(page)
+        if kinds[page_num] in CHECKED_KINDS:
+            evaluate_page_span_rules(page, FONT_RULES, r)
+            validate_page_style(page, r)
+            headings.append(page_heading(page))
+        page.release()
+        del page
+
+        if (page_num + 1) % shrink_every == 0:
+            _shrink_store()
+        if rss_budget is not None:
+            rss = current_rss()
+            if rss is not None and rss > rss_budget:
+                _shrink_store()
+                rss = current_rss()
+                if rss is not None and rss > rss_budget and not over_budget:
+                    over_budget = True
+                    r.log.append(f"Превышен лимит памяти {rss_budget // 2 ** 20} МБ "
+                                 f"на странице {page_num + 1}: {rss // 2 ** 20} МБ")
+
+    check_headings_order(headings, r)
+    if len(headings) < len(kinds):
+        r.log.append(classification_note(kinds))
+    return r
@@ -1,8 +1,28 @@
+import io
+import mmap
+from pathlib import Path
+
 import pymupdf
 
+from src.validator.api import validate_document
+from src.validator.heading_match import match_headings
+from src.validator.pdf.classify import PageKind, classify_pages
+from src.validator.pdf.columnar import SpanTable, validate_columnar
+from src.validator.pdf.headings_checker import extract_and_check_headings_from_pdf
+from src.validator.pdf.layout import DocumentLayout
+from src.validator.pdf.open_doc import open_pdf, validate_pdf
+from src.validator.pdf.page_cache import PageCache, validate_pdf_cached
+from src.validator.pdf.parallel import validate_pdf_parallel
+from src.validator.pdf.sampling import HeadTail, PageRanges, StratifiedSample
+from src.validator.pdf.spans import first_line_text, page_number_candidate
+from src.validator.pdf.streaming import validate_pdf_streaming
 from src.validator.pdf.validate_font import validate_font
-from src.validator.pdf.validate_headers import validate_headings_order, REQUIRED_HEADINGS
+from src.validator.pdf.validate_headers import validate_headings_order, page_heading, REQUIRED_HEADINGS
+from src.validator.pdf.validate_inpage_style import validate_inpage_stype
 from src.validator.result import ValidationResult, ErrCause
+from src.validator.text_search import AhoCorasick
+
+_LATEX_TEST = Path(__file__).parents[4] / "latex_test"
 
 
 def test_validate_font_valid():
@@ -64,3 +84,288 @@ def test_validate_headings_correct_order(monkeypatch):
             "src.validator.pdf.validate_headers.REQUIRED_HEADINGS",
             original_headings
         )
+
+
+def test_layout_extracts_page_once():
+    doc = pymupdf.open()
+    page = doc.new_page()
+    page.insert_text((100, 100), "Valid text", fontname="Times-Roman", fontsize=12)
+
+    layout = DocumentLayout(doc)
+    assert layout.page(0) is layout.page(0)
+
+    result = ValidationResult.empty()
+    validate_font(layout, result)
+    validate_headings_order(layout, result)
+    assert ErrCause.INVALID_FONT not in result.errors
+
+
+def test_parallel_matches_serial(tmp_path):
+    doc = pymupdf.open()
+    for i in range(6):
+        page = doc.new_page()
+        fontname = "Courier" if i in (2, 4) else "Times-Roman"
+        page.insert_text((100, 100), f"Page text {i}", fontname=fontname, fontsize=12)
+    path = str(tmp_path / "doc.pdf")
+    doc.save(path)
+
+    serial = validate_pdf(pymupdf.open(path))
+    parallel = validate_pdf_parallel(path, workers=2, pages_per_range=2)
+
+    assert parallel.errors == serial.errors
+    assert "странице 3" in parallel.errors[ErrCause.INVALID_FONT]
+
+
+def test_span_accessors_handle_apostrophes():
+    block = {"type": 0, "bbox": (0, 0, 10, 10), "lines": [
+        {"bbox": (0, 0, 10, 10), "spans": [{"text": "L'Hôpital", "font": "", "size": 12, "bbox": (0, 0, 5, 10)},
+                                           {"text": " rule", "font": "", "size": 12, "bbox": (5, 0, 10, 10)}]},
+        {"bbox": (0, 0, 10, 10), "spans": [{"text": " 12 ", "font": "", "size": 12, "bbox": (0, 0, 5, 10)}]},
+    ]}
+    assert first_line_text(block) == "L'Hôpital rule"
+    assert page_number_candidate(block) == 12
+
+
+def test_validate_font_stops_when_saturated():
+    doc = pymupdf.open()
+    for _ in range(3):
+        page = doc.new_page()
+        page.insert_text((100, 100), "Invalid text", fontname="Courier", fontsize=11)
+
+    layout = DocumentLayout(doc)
+    result = ValidationResult.empty()
+    validate_font(layout, result)
+
+    assert "странице 1" in result.errors[ErrCause.INVALID_FONT]
+    assert "странице 1" in result.errors[ErrCause.INVALID_FONT_SIZE]
+    assert len(layout._cache) == 1
+
+
+def test_inpage_checks_skip_span_extraction():
+    doc = pymupdf.open()
+    page = doc.new_page()
+    page.insert_text((100, 100), "INTRODUCTION", fontsize=14)
+    page.insert_text((page.rect.width / 2, page.rect.height - 30), "1", fontsize=12)
+
+    layout = DocumentLayout(doc)
+    result = ValidationResult.empty()
+    validate_inpage_stype(layout, result)
+
+    assert ErrCause.INVALID_PAGE_NUMBERING not in result.errors
+    assert page_heading(layout.page(0)) == "INTRODUCTION"
+    assert layout.page(0)._blocks is None
+
+
+def test_headings_checker_outline_and_fallback():
+    doc = pymupdf.open(str(_LATEX_TEST / "test_1.pdf"))
+    assert extract_and_check_headings_from_pdf(doc)["status"] == "passed"
+
+    toc = doc.get_toc()
+    toc.append([1, "NONEXISTENT HEADING", 3])
+    doc.set_toc(toc)
+    result = extract_and_check_headings_from_pdf(doc)
+    assert result["missing_headings"] == ["NONEXISTENT HEADING"]
+
+    doc.set_toc([])
+    assert extract_and_check_headings_from_pdf(doc)["status"] == "passed"
+
+
+def test_headings_checker_reports_order():
+    doc = pymupdf.open(str(_LATEX_TEST / "test_1.pdf"))
+    toc = [[1, title, page] for _, title, page in doc.get_toc()]
+    toc[1], toc[-1] = toc[-1], toc[1]
+    doc.set_toc(toc)
+
+    result = extract_and_check_headings_from_pdf(doc)
+
+    assert result["status"] == "failed"
+    assert result["missing_headings"] == []
+    assert sorted(result["out_of_order_headings"]) == ["СПИСОК ИСПОЛЬЗОВАННЫХ ИСТОЧНИКОВ", "ТЕРМИНЫ И ОПРЕДЕЛЕНИЯ"]
+
+
+def _toc_document(toc: list[str], headings: list[str]) -> pymupdf.Document:
+    """Документ без outline: страница содержания и по заголовку на странице."""
+    doc = pymupdf.open()
+    page = doc.new_page()
+    page.insert_text((100, 50), "СОДЕРЖАНИЕ", fontname="china-s", fontsize=14)
+    for i, entry in enumerate(toc):
+        page.insert_text((100, 80 + 20 * i), f"{entry} ..... {i + 2}", fontname="tiro", fontsize=12)
+    for heading in headings:
+        doc.new_page().insert_text((100, 50), heading, fontname="tiro", fontsize=14)
+    return doc
+
+
+def test_headings_checker_repeated_entries_and_subset():
+    toc = ["Chapter 1", "Conclusions", "Chapter 2", "Conclusions"]
+    doc = _toc_document(toc, toc)
+
+    assert extract_and_check_headings_from_pdf(doc)["status"] == "passed"
+    # Поиск идёт по страницам разметки, а не по первым len(layout) номерам
+    assert extract_and_check_headings_from_pdf(DocumentLayout(doc, [0, 3, 4]))["missing_headings"] == toc[:2]
+
+    # Повторяющиеся пункты сопоставляются так же, как в DOCX (HeadingIndex)
+    body = ["Chapter 2", "Conclusions", "Chapter 1", "Conclusions"]
+    result = extract_and_check_headings_from_pdf(_toc_document(toc, body))
+    assert result["out_of_order_headings"] == match_headings(toc, body).out_of_order == ["Chapter 1", "Conclusions"]
+
+
+def test_aho_corasick_matches_substring_search():
+    patterns = ["введение", "заключение", "ключ", "ение"]
+    text = "1 введение и заключение"
+    found = AhoCorasick(patterns).search(text)
+    assert found == {i for i, p in enumerate(patterns) if p in text}
+
+
+def test_font_prescreen_skips_span_extraction():
+    doc = pymupdf.open()
+    page = doc.new_page()
+    page.insert_text((100, 100), "Valid text", fontname="Times-Roman", fontsize=12)
+    page = doc.new_page()
+    page.insert_text((100, 100), "Invalid text", fontname="Courier", fontsize=12)
+
+    layout = DocumentLayout(doc)
+    result = ValidationResult.empty()
+    result.add_err(ErrCause.INVALID_FONT_SIZE, "already reported")
+    validate_font(layout, result)
+
+    assert layout.page(0)._blocks is None
+    assert "странице 2" in result.errors[ErrCause.INVALID_FONT]
+
+
+def test_page_selection_strategies():
+    assert PageRanges((2, 4), (9, 20)).select(10) == [1, 2, 3, 8, 9]
+    assert HeadTail(2).select(10) == [0, 1, 8, 9]
+    assert HeadTail(5).select(3) == [0, 1, 2]
+
+    sample = StratifiedSample(4, seed=7).select(100)
+    assert sample == StratifiedSample(4, seed=7).select(100)
+    assert [p // 25 for p in sample] == [0, 1, 2, 3]
+
+
+def test_validate_pdf_reports_coverage():
+    doc = pymupdf.open()
+    for _ in range(10):
+        page = doc.new_page()
+        page.insert_text((100, 100), "Valid text", fontname="Times-Roman", fontsize=12)
+
+    result = validate_pdf(doc, pages=HeadTail(1))
+
+    assert result.log == ["Проверено страниц: 2 из 10 (20%)"]
+    assert ErrCause.INVALID_SECTIONS_ORDER not in result.errors
+
+
+def test_columnar_rules_match_span_rules():
+    doc = pymupdf.open()
+    for fontname, fontsize, y in [("Times-Roman", 12, 100), ("Times-Roman", 16, 100), ("Courier", 12, 30)]:
+        page = doc.new_page()
+        page.insert_text((100, y), "Some text\n" * 20, fontname=fontname, fontsize=fontsize)
+
+    expected = ValidationResult.empty()
+    validate_font(doc, expected)
+    result = ValidationResult.empty()
+    table = SpanTable(doc)
+    validate_columnar(table, result)
+
+    assert result.errors[ErrCause.INVALID_FONT] == expected.errors[ErrCause.INVALID_FONT]
+    assert result.errors[ErrCause.INVALID_FONT_SIZE] == expected.errors[ErrCause.INVALID_FONT_SIZE]
+    # Текст третьей страницы заходит на верхнее поле; страницы нумеруются с единицы, как в сообщениях о шрифтах
+    assert result.errors[ErrCause.INVALID_PAGE_FIELDS] == "некорректные поля на странице 3"
+    validate_inpage_stype(doc, expected)
+    assert expected.errors[ErrCause.INVALID_PAGE_FIELDS] == "некорректные поля на странице 3"
+    assert sorted({page for page, _ in table.heading_lines()}) == [0, 1, 2]
+
+
+def test_open_pdf_from_memory(tmp_path):
+    path = tmp_path / "doc.pdf"
+    doc = pymupdf.open()
+    doc.new_page().insert_text((100, 100), "Invalid text", fontname="Courier", fontsize=12)
+    doc.save(str(path))
+    data = path.read_bytes()
+
+    for source in (data, memoryview(data), io.BytesIO(data)):
+        with open_pdf(source) as opened:
+            assert ErrCause.INVALID_FONT in validate_pdf(opened).errors
+
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        assert ErrCause.INVALID_FONT in validate_document(mapped, "pdf").errors
+
+
+def test_image_pages_skip_text_validators(tmp_path):
+    doc = pymupdf.open()
+    text = doc.new_page()
+    text.insert_text((100, 100), "Valid text", fontname="Times-Roman", fontsize=12)
+    text.insert_text((text.rect.width / 2, text.rect.height - 20), "1", fontname="Times-Roman", fontsize=12)
+    scan = doc.new_page()
+    pixmap = pymupdf.Pixmap(pymupdf.csRGB, pymupdf.IRect(0, 0, 20, 20), False)
+    scan.insert_image(scan.rect, pixmap=pixmap)
+    doc.new_page()
+
+    kinds = classify_pages(DocumentLayout(doc))
+    result = validate_pdf(doc)
+
+    assert kinds == {0: PageKind.TEXT, 1: PageKind.IMAGE, 2: PageKind.BLANK}
+    assert ErrCause.INVALID_PAGE_NUMBERING not in result.errors
+    # Пропущенные страницы без текста не скрывают отсутствие обязательных секций
+    assert result.errors[ErrCause.INVALID_SECTIONS_ORDER] == "не все необходимые секции включены в документ"
+    path = tmp_path / "scan.pdf"
+    doc.save(str(path))
+    for other in (validate_pdf_streaming(doc, rss_budget=None), validate_pdf_cached(doc, PageCache()),
+                  validate_pdf_parallel(str(path), workers=2, pages_per_range=1)):
+        assert other.errors[ErrCause.INVALID_SECTIONS_ORDER] == result.errors[ErrCause.INVALID_SECTIONS_ORDER]
+    assert result.log == ["Типы страниц (изображения и пустые не проверяются): текст - 1; изображение - 2; пустая - 3"]
+
+
+def test_mixed_pages_are_validated():
+    doc = pymupdf.open()
+    page = doc.new_page()
+    pixmap = pymupdf.Pixmap(pymupdf.csRGB, pymupdf.IRect(0, 0, 20, 20), False)
+    page.insert_image(pymupdf.Rect(0, 0, page.rect.width, page.rect.height * 0.7), pixmap=pixmap)
+    page.insert_text((100, page.rect.height * 0.8), "Figure 1. Caption text\n" * 8, fontname="Courier", fontsize=12)
+
+    assert classify_pages(DocumentLayout(doc)) == {0: PageKind.MIXED}
+    for result in (validate_pdf(doc), validate_pdf_streaming(doc, rss_budget=None)):
+        assert result.errors[ErrCause.INVALID_FONT] == "На странице 1 используется шрифт Courier"
+
+
+def test_streaming_matches_validate_pdf(monkeypatch):
+    doc = pymupdf.open()
+    for i in range(10):
+        page = doc.new_page()
+        page.insert_text((100, 100), "Some text\n" * 20, fontname="Courier" if i == 6 else "Times-Roman",
+                         fontsize=16 if i == 8 else 12)
+    shrinks = []
+    monkeypatch.setattr(pymupdf.TOOLS, "store_shrink", shrinks.append)
+
+    result = validate_pdf_streaming(doc, shrink_every=4, rss_budget=None)
+
+    assert result.errors == validate_pdf(doc).errors
+    assert shrinks == [100, 100]
+
+    result = validate_pdf_streaming(doc, rss_budget=1)
+
+    assert len(result.log) == 1 and result.log[0].startswith("Превышен лимит памяти")
+
+
+def _revision(fonts):
+    doc = pymupdf.open()
+    for fontname in fonts:
+        doc.new_page().insert_text((100, 100), "Some text\n" * 20, fontname=fontname, fontsize=12)
+    return pymupdf.open("pdf", doc.tobytes())
+
+
+def test_page_cache_rechecks_changed_pages(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = PageCache()
+    first = _revision(["Times-Roman"] * 5)
+    result = validate_pdf_cached(first, cache)
+    cache.save(path)
+
+    assert result.errors == validate_pdf(first).errors
+    assert result.log == ["Перепроверено страниц: 5 из 5"]
+
+    second = _revision(["Times-Roman", "Times-Roman", "Courier", "Times-Roman", "Times-Roman"])
+    result = validate_pdf_cached(second, PageCache.load(path))
+
+    assert result.errors == validate_pdf(second).errors
+    assert "странице 3" in result.errors[ErrCause.INVALID_FONT]
+    assert result.log == ["Перепроверено страниц: 1 из 5"]
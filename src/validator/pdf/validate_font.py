@@ -1,5 +1,10 @@
+from functools import lru_cache
+
 from pymupdf import Document
 
+from src.validator.pdf.layout import DocumentLayout, PageLayout, normalize_font_name
+from src.validator.pdf.span_rules import SpanRule, evaluate_span_rules
+from src.validator.pdf.spans import Span
 from src.validator.result import ValidationResult, ErrCause
 
 _HEADINGS = [
@@ -11,36 +16,45 @@ _HEADINGS = [
 ]
 
 _FONT_NAME = ["timesnewroman", "times-roman", "times-new-roman"]
+# Допустимый размер шрифта незаголовочного текста (границы не включаются)
+FONT_SIZE_RANGE = (11, 15)
+
+@lru_cache(maxsize=None)
+def is_allowed_font(font_name: str) -> bool:
+    return normalize_font_name(font_name) in _FONT_NAME
+
+
+def is_heading_text(text: str) -> bool:
+    return text.upper() in _HEADINGS
+
+
+class FontNameRule(SpanRule):
+    cause = ErrCause.INVALID_FONT
+
+    def applies_to(self, page: PageLayout) -> bool:
+        # Если в ресурсах страницы только разрешённые шрифты, спаны проверять незачем
+        return not all(font in _FONT_NAME for font in page.fonts)
+
+    def check(self, span: Span, text: str, page_num: int) -> str | None:
+        font_name = span["font"]
+        if not is_allowed_font(font_name):
+            return f"На странице {page_num + 1} используется шрифт {font_name}"
+        return None
+
+
+class FontSizeRule(SpanRule):
+    cause = ErrCause.INVALID_FONT_SIZE
+
+    def check(self, span: Span, text: str, page_num: int) -> str | None:
+        font_size = span["size"]
+        low, high = FONT_SIZE_RANGE
+        if not is_heading_text(text) and not (low < font_size < high):
+            return f"На странице {page_num + 1} размер шрифта {font_size}pt вне диапазона 12-14pt."
+        return None
+
+
+FONT_RULES: list[SpanRule] = [FontNameRule(), FontSizeRule()]
 
-def __validate_font(block, page_num, r: ValidationResult):
-    font_found = False
-    font_sz_found = False
-    for line in block.get("lines", []):
-        for span in line.get("spans", []):
-            if font_found and font_sz_found:
-                return
-            font_name = span.get("font", "")
-            font_size = span.get("size", 0)
-            text = str(span.get("text", "")).strip().upper()
-            if (not font_found) and (str(font_name).lower().replace(" ", "") not in _FONT_NAME) \
-                and text.replace(" ", "") != "":
-                r.add_err(
-                    ErrCause.INVALID_FONT,
-                    f"На странице {page_num + 1} используется шрифт {font_name}"
-                )
-                font_found = True
-            if (not font_sz_found) and (not text in _HEADINGS) and (not (11 < font_size < 15)) \
-                    and text.replace(" ", "") != "":
-                r.add_err(
-                    ErrCause.INVALID_FONT_SIZE,
-                    f"На странице {page_num + 1} размер шрифта {font_size}pt вне диапазона 12-14pt."
-                )
-                font_sz_found = True
-
-def validate_font(doc: Document, r: ValidationResult):
-    for page_num in range(len(doc)):
-        page = doc[page_num]
-        text_dict = page.get_text("dict")
-        for block in text_dict["blocks"]:
-            __validate_font(block, page_num, r)
 
+def validate_font(doc: Document | DocumentLayout, r: ValidationResult):
+    evaluate_span_rules(doc, FONT_RULES, r)
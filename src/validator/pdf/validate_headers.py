@@ -1,7 +1,8 @@
-import re
+from typing import Iterable
 
 from pymupdf import Document
 
+from src.validator.pdf.layout import DocumentLayout, PageLayout, as_layout
 from src.validator.result import ValidationResult, ErrCause
 
 REQUIRED_HEADINGS = [
@@ -12,14 +13,46 @@ REQUIRED_HEADINGS = [
     "СПИСОК ИСПОЛЬЗУЕМЫХ ИСТОЧНИКОВ"
 ]
 
-def __extract_page_header(s: str) -> str:
-    m = re.search(r"'text'\s*:\s*'([^']+)'", s)
-    if not m:
+def page_heading(page: PageLayout) -> str:
+    """Текст самого верхнего текстового блока страницы (кандидат в заголовок)."""
+    # Найдём текстовый блок с минимальным y (самый верхний блок) на странице;
+    # для этого хватает bbox блоков, спаны не извлекаются
+    top_box = min(page.boxes, key=lambda box: box.bbox[1], default=None)
+    if top_box is None:
         return ""
+    return top_box.text.split("\n", 1)[0].strip()
 
-    return m.group(1).strip()
+def check_headings_order(headings: Iterable[str], r: ValidationResult, complete: bool = True):
+    """
+    Проверяет последовательность заголовков страниц (см. validate_headings_order).
+    complete=False означает, что проверена лишь часть страниц: тогда требуемые заголовки
+    могут пропускаться, и проверяется только их взаимный порядок.
+    """
+    if not complete:
+        last_i = -1
+        for heading_text in headings:
+            if heading_text in REQUIRED_HEADINGS:
+                heading_i = REQUIRED_HEADINGS.index(heading_text)
+                if heading_i <= last_i:
+                    r.add_err(ErrCause.INVALID_SECTIONS_ORDER, f"секция '{heading_text}' расположена некорректно")
+                    return
+                last_i = heading_i
+        return
+
+    current_heading_i = 0
+
+    for heading_text in headings:
+        # Если заголовок совпадает - запоминаем
+        if current_heading_i < len(REQUIRED_HEADINGS) and heading_text == REQUIRED_HEADINGS[current_heading_i]:
+            current_heading_i += 1
+        elif heading_text in REQUIRED_HEADINGS:
+            r.add_err(ErrCause.INVALID_SECTIONS_ORDER, f"секция '{heading_text}' расположена некорректно")
+            return
 
-def validate_headings_order(doc: Document, r: ValidationResult):
+    if current_heading_i + 1 < len(REQUIRED_HEADINGS):
+        r.add_err(ErrCause.INVALID_SECTIONS_ORDER, "не все необходимые секции включены в документ")
+
+def validate_headings_order(doc: Document | DocumentLayout, r: ValidationResult, complete: bool | None = None):
     """
     Проверяет, что на страницах, где размещены требуемые заголовки, каждый заголовок является первым элементом,
     а сами требуемые заголовки следуют в заданной последовательности (при игнорировании прочих заголовков).
@@ -28,28 +61,9 @@ def validate_headings_order(doc: Document, r: ValidationResult):
       3. "ВВЕДЕНИЕ"
       4. "ЗАКЛЮЧЕНИЕ"
       5. "СПИСОК ИСПОЛЬЗУЕМЫХ ИСТОЧНИКОВ"
+    complete по умолчанию определяется тем, охватывает ли разметка все страницы документа.
     """
-    current_heading_i = 0
-
-    for page_num in range(len(doc)):
-        page = doc[page_num]
-        text_dict = page.get_text("dict")
-        # Найдём текстовый блок с минимальным y (самый верхний блок) на странице
-        top_block = None
-        for block in text_dict.get("blocks", []):
-            if block["type"] != 0:
-                continue
-            if top_block is None or block["bbox"][1] < top_block["bbox"][1]:
-                top_block = block
-        if top_block:
-            heading_text = __extract_page_header(str(top_block))
-            print(f"top block {top_block}")
-            # Если заголовок совпадает - запоминаем
-            if heading_text == REQUIRED_HEADINGS[current_heading_i]:
-                current_heading_i += 1
-            elif heading_text in REQUIRED_HEADINGS:
-                r.add_err(ErrCause.INVALID_SECTIONS_ORDER, f"секция '{heading_text}' расположена некорректно")
-                return
-
-    if current_heading_i + 1 < len(REQUIRED_HEADINGS):
-        r.add_err(ErrCause.INVALID_SECTIONS_ORDER, "не все необходимые секции включены в документ")
\ No newline at end of file
+    layout = as_layout(doc)
+    if complete is None:
+        complete = len(layout) == len(layout.doc)
+    check_headings_order((page_heading(page) for page in layout), r, complete=complete)
@@ -1,60 +1,63 @@
-import re
-
-from pymupdf import Document
+from pymupdf import Document, Rect
 
+from src.validator.pdf.layout import DocumentLayout, PageLayout, as_layout
+from src.validator.pdf.spans import page_number_candidate
 from src.validator.result import ValidationResult, ErrCause
 
 _TOL = 100
+# Номер страницы ищем в полосе такой высоты у нижнего края
+_FOOTER_BAND = 50
+# Поля учитываются только для блоков длиннее этого числа символов
+FIELDS_MIN_TEXT = 150
+
+# Для листа A4 размеры примерно 210x297 мм. Перевод в поинты (1 мм ≈ 2.83465 pt)
+# Левое поле: 30мм -> ~85pt, правое: 10-15мм (~28pt-42pt), верхнее и нижнее: 20мм (~57pt)
+LEFT_BOUND = 85
+RIGHT_FIELD = 42
+TOP_BOUND = 57
+BOTTOM_FIELD = 57
+
+
+def validate_page_fields(page: PageLayout, r: ValidationResult):
+    # достаточно bbox и текста блоков, спаны не нужны
+    right_bound = page.width - RIGHT_FIELD
+    bottom_bound = page.height - BOTTOM_FIELD
+    for box in page.boxes:
+        bbox = box.bbox  # [x0, y0, x1, y1]
+        if len(box.text) > FIELDS_MIN_TEXT and \
+                (bbox[0] < LEFT_BOUND or bbox[2] > right_bound or bbox[1] < TOP_BOUND or bbox[3] > bottom_bound):
+            r.add_err(ErrCause.INVALID_PAGE_FIELDS, f"некорректные поля на странице {page.number + 1}")
+            return
+
+
+def validate_page_numbering(page: PageLayout, r: ValidationResult):
+    # извлекаем только полосу нижнего поля
+    mid_x = page.width / 2
+    bottom_y = page.height
+    for block in page.region(Rect(0, bottom_y - _FOOTER_BAND, page.width, bottom_y)):
+        if block["type"] != 0:
+            continue
+        bbox = block["bbox"]
+        if abs(bbox[3] - bottom_y) < _FOOTER_BAND:
+            page_n = page_number_candidate(block)
+            if page_n > 0:
+                block_mid_x = (bbox[0] + bbox[2]) / 2
+                if abs(block_mid_x - mid_x) < _TOL and page_n == page.number + 1:
+                    return
+
+    r.add_err(ErrCause.INVALID_PAGE_NUMBERING, "некорректная нумерация страниц")
+
+
+def validate_page_style(page: PageLayout, r: ValidationResult):
+    """Поля и нумерация одной страницы; уже найденные нарушения повторно не ищутся."""
+    if not r.has_err(ErrCause.INVALID_PAGE_FIELDS):
+        validate_page_fields(page, r)
+    if not r.has_err(ErrCause.INVALID_PAGE_NUMBERING):
+        validate_page_numbering(page, r)
 
 
-def __extract_page_number(s: str) -> int:
-    for m in re.finditer(r"'text'\s*:\s*'([^']+)'", s):
-        val = m.group(1).strip()
-        if re.fullmatch(r'[+-]?\d+', val):
-            try:
-                return int(val)
-            except ValueError:
-                continue
-    return 0
-
-
-def validate_inpage_stype(doc: Document, r: ValidationResult):
-    for page_num in range(len(doc)):
-        page = doc[page_num]
-        page_rect = page.rect
-        # Для листа A4 размеры примерно 210x297 мм. Перевод в поинты (1 мм ≈ 2.83465 pt)
-        # Левое поле: 30мм -> ~85pt, правое: 10-15мм (~28pt-42pt), верхнее и нижнее: 20мм (~57pt)
-        left_bound = 85
-        right_bound = page_rect.width - 42
-        top_bound = 57
-        bottom_bound = page_rect.height - 57
-
-        mid_x = page_rect.width / 2
-        bottom_y = page_rect.height
-
-        text_dict = page.get_text("dict")
-        numbering_found = False
-
-        for block in text_dict["blocks"]:
-            if block["type"] != 0:
-                continue
-            bbox = block["bbox"]  # [x0, y0, x1, y1]
-
-            # проверяем поля
-            if (block.get("text") and len(block["text"] > 150)) and (not r.has_err(ErrCause.INVALID_PAGE_FIELDS)):
-                if bbox[0] < left_bound or bbox[2] > right_bound or bbox[1] < top_bound or bbox[3] > bottom_bound:
-                    r.add_err(ErrCause.INVALID_PAGE_FIELDS, f"некорректные поля на странице {page_num}")
-
-            # проверяем нумерацию
-            if abs(bbox[3] - bottom_y) < 50:
-                page_n = __extract_page_number(str(block))
-                if page_n > 0:
-                    block_mid_x = (bbox[0] + bbox[2]) / 2
-                    if abs(block_mid_x - mid_x) < _TOL and page_n == page_num + 1:
-                        numbering_found = True
-                        break
-
-        if not numbering_found:
-            r.add_err(ErrCause.INVALID_PAGE_NUMBERING, "некорректная нумерация страниц")
+def validate_inpage_stype(doc: Document | DocumentLayout, r: ValidationResult):
+    for page in as_layout(doc):
+        validate_page_style(page, r)
         if r.has_err(ErrCause.INVALID_PAGE_NUMBERING) and r.has_err(ErrCause.INVALID_PAGE_FIELDS):
             return
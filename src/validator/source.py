@@ -0,0 +1,40 @@
+import io
+import mmap
+import os
+from typing import BinaryIO
+
+# Документ можно передать путём к файлу или содержимым в памяти: bytes, memoryview,
+# mmap файла или бинарным потоком (например, телом загруженного файла)
+Source = str | os.PathLike | bytes | bytearray | memoryview | mmap.mmap | BinaryIO
+
+
+def is_path(source: Source) -> bool:
+    return isinstance(source, (str, os.PathLike))
+
+
+def as_buffer(source: Source) -> bytes | memoryview:
+    """
+    Содержимое документа как буфер. bytes, memoryview и mmap отдаются без копирования,
+    поток читается целиком.
+    """
+    if isinstance(source, (bytes, memoryview)):
+        return source
+    if isinstance(source, (bytearray, mmap.mmap)):
+        return memoryview(source)
+    if is_path(source):
+        raise TypeError("ожидалось содержимое документа, а не путь к файлу")
+    return source.read()
+
+
+def as_file(source: Source) -> str | os.PathLike | BinaryIO:
+    """
+    Путь или seekable-файл для библиотек, которым нужен файловый объект (zip внутри docx).
+    mmap до Python 3.13 не реализует seekable(), поэтому оборачивается в BytesIO.
+    """
+    if is_path(source):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        return io.BytesIO(source)
+    if source.seekable():
+        return source
+    return io.BytesIO(source.read())
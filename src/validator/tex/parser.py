@@ -1,8 +1,13 @@
+import re
+from typing import Iterable, Iterator
+
 from pylatexenc.latexwalker import LatexWalker, get_default_latex_context_db
-from pylatexenc.macrospec import MacroSpec
+from pylatexenc.macrospec import MacroSpec, MacroStandardArgsParser
+
+from src.validator.source import Source, as_buffer, is_path
 
-_LATEX_CONTEXT = get_default_latex_context_db()
-_LATEX_CONTEXT.add_context_category(
+LATEX_CONTEXT = get_default_latex_context_db()
+LATEX_CONTEXT.add_context_category(
     'my-macros',
     prepend=True,
     macros=[
@@ -13,12 +18,102 @@ _LATEX_CONTEXT.add_context_category(
     ]
 )
 
+def load_latex(source: Source) -> str:
+    """Исходный текст LaTeX по пути или из памяти (bytes, memoryview, mmap, бинарный поток)."""
+    if is_path(source):
+        with open(source, encoding='utf-8') as f:
+            return f.read()
+    return str(as_buffer(source), 'utf-8')
+
 def parse_latex_structure(latex_content: str) -> list:
-    walker = LatexWalker(latex_content, latex_context=_LATEX_CONTEXT)
+    walker = LatexWalker(latex_content, latex_context=LATEX_CONTEXT)
     nodes, pos, len_ = walker.get_latex_nodes()
 
     return nodes
 
+# Макрос (имя из букв или один символ, в том числе \\ и \%) или начало комментария
+_TOKEN = re.compile(r"\\(?:([A-Za-z@]+)|.)|%", re.S)
+# Разделитель \verb и \verb*
+_VERB_DELIMITER = re.compile(r"\*?([^A-Za-z\s])")
+_ENVIRONMENT = re.compile(r"\s*\{([^{}]*)\}")
+
+
+def _is_verbatim(environment: str) -> bool:
+    spec = LATEX_CONTEXT.get_environment_spec(environment)
+    return spec is not None and type(spec.args_parser) is not MacroStandardArgsParser
+
+
+def iter_macros(latex_content: str, pos: int = 0) -> Iterator[re.Match]:
+    """
+    Макросы вне комментариев, начиная с pos, в порядке следования (group(1) - имя из букв).
+    Текст читается слева направо, как в TeX: \\\\ и \\% - отдельные токены, поэтому
+    \\\\\\color и \\\\% разбираются верно. Содержимое \\verb и verbatim-окружений пропускается.
+    """
+    while True:
+        token = _TOKEN.search(latex_content, pos)
+        if token is None:
+            return
+        pos = token.end()
+        if token.group() == "%":
+            end = latex_content.find("\n", pos)
+            if end < 0:
+                return
+            pos = end + 1
+            continue
+        name = token.group(1)
+        if name == "verb":
+            delimiter = _VERB_DELIMITER.match(latex_content, pos)
+            if delimiter is not None:
+                end = latex_content.find(delimiter.group(1), delimiter.end())
+                pos = len(latex_content) if end < 0 else end + 1
+            continue
+        yield token
+        environment = _ENVIRONMENT.match(latex_content, pos) if name == "begin" else None
+        if environment is not None and _is_verbatim(environment.group(1)):
+            end = re.compile(r"\\end\s*\{" + re.escape(environment.group(1)) + r"\}").search(latex_content, pos)
+            pos = len(latex_content) if end is None else end.end()
+
+
+def find_document_start(latex_content: str) -> int | None:
+    """Позиция \\begin{document} вне комментариев; None - окружения document нет."""
+    for token in iter_macros(latex_content):
+        if token.group(1) == "begin":
+            environment = _ENVIRONMENT.match(latex_content, token.end())
+            if environment is not None and environment.group(1) == "document":
+                return token.start()
+    return None
+
+
+def scan_body_macros(latex_content: str, start: int, macronames: Iterable[str]) -> list:
+    """
+    Лёгкий просмотр тела документа: среди макросов вне комментариев и \\verb (iter_macros)
+    отбираются только macronames, и pylatexenc разбирает каждый найденный макрос вместе
+    с аргументами, а не весь текст.
+    """
+    names = set(macronames)
+    if not names:
+        return []
+    walker = LatexWalker(latex_content, latex_context=LATEX_CONTEXT)
+    nodes = []
+    for token in iter_macros(latex_content, start):
+        if token.group(1) in names:
+            found, _, _ = walker.get_latex_nodes(pos=token.start(), read_max_nodes=1)
+            nodes.extend(found)
+    return nodes
+
+
+def parse_latex_preamble(latex_content: str, body_macros: Iterable[str]) -> list:
+    """
+    Узлы преамбулы (до \\begin{document}), разобранные pylatexenc полностью, и за ними
+    макросы body_macros из тела документа в порядке следования. Тело целиком не разбирается.
+    Без окружения document разбирается весь текст.
+    """
+    start = find_document_start(latex_content)
+    if start is None:
+        return parse_latex_structure(latex_content)
+    return parse_latex_structure(latex_content[:start]) + scan_body_macros(latex_content, start, body_macros)
+
+
 def extract_mandatory_args(node):
     args = []
     if hasattr(node, 'nodeargs') and node.nodeargs is not None:
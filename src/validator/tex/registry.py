@@ -0,0 +1,31 @@
+from typing import Callable
+
+from pylatexenc.latexwalker import LatexMacroNode
+
+from src.validator.result import ValidationResult
+
+MacroRule = Callable[[LatexMacroNode, ValidationResult], None]
+
+# Имя макроса -> проверки, которым он нужен (в порядке регистрации)
+MACRO_RULES: dict[str, list[MacroRule]] = {}
+# Макросы, которые имеют смысл и в теле документа; остальные ищутся только в преамбуле
+BODY_MACROS: set[str] = set()
+
+
+def macro_rule(*macronames: str, body: bool = False) -> Callable[[MacroRule], MacroRule]:
+    """
+    Регистрирует проверку для перечисленных макросов. Обход дерева вызывает её только
+    для этих макросов: одно обращение к словарю на макрос вместо вызова всех проверок.
+    body=True - макросы встречаются и после \\begin{document} (см. parse_latex_preamble).
+    """
+    def register(rule: MacroRule) -> MacroRule:
+        for name in macronames:
+            MACRO_RULES.setdefault(name, []).append(rule)
+        if body:
+            BODY_MACROS.update(macronames)
+        return rule
+    return register
+
+
+def rules_for(macroname: str) -> list[MacroRule]:
+    return MACRO_RULES.get(macroname, [])
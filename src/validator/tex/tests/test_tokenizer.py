@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import pytest
+from pylatexenc.latexwalker import LatexMacroNode
+
+from src.validator.tex import registry
+from src.validator.tex.parser import extract_mandatory_args, extract_optional_arg, load_latex, parse_latex_preamble
+from src.validator.tex.tokenizer import UnsupportedTeX, iter_macro_calls
+from src.validator.tex.traverse_nodes import traverse_macro_calls, traverse_nodes, validate_latex
+
+_LATEX_TEST = Path(__file__).parents[4] / "latex_test"
+
+_TRICKY = "\n".join([
+    r"\documentclass[a4paper,14pt]{extarticle} % \documentclass[10pt]{article}",
+    r"\newcommand{\warn}{\color{red}}",
+    r"\usepackage[left=30mm, right=10mm, top=20mm, bottom=20mm]{geometry}",
+    r"\geometry{left=30mm, % comment with } and \color{red}",
+    r"  right=10mm,top=20mm,bottom=20mm}",
+    r"\setlength\parindent  {1.25cm}",
+    r"\def\braces{\{ \} \\}",
+    r"\begin{document}",
+    r"\onehalfspacing Text with \verb|x| and 100\% \\",
+    r"\textcolor{blue}{\{escaped\} \textbf{bold}} {\color{black} group}",
+    r"\end{document}",
+])
+
+
+def _pylatexenc_calls(nodes: list) -> list:
+    """Макросы проверок в порядке обхода traverse_nodes."""
+    calls = []
+    for node in nodes:
+        if isinstance(node, LatexMacroNode) and node.macroname in registry.MACRO_RULES:
+            calls.append((node.macroname, extract_mandatory_args(node), extract_optional_arg(node)))
+        if getattr(node, "nodelist", None):
+            calls.extend(_pylatexenc_calls(node.nodelist))
+    return calls
+
+
+def _tokenizer_calls(latex: str) -> list:
+    return [(call.macroname, extract_mandatory_args(call), extract_optional_arg(call))
+            for call in iter_macro_calls(latex, registry.MACRO_RULES, registry.BODY_MACROS)]
+
+
+# Дифференциальный тест: токенизатор и pylatexenc выдают одни и те же вызовы и результат
+@pytest.mark.parametrize("latex", [load_latex(path) for path in sorted(_LATEX_TEST.glob("*.tex"))] + [_TRICKY])
+def test_tokenizer_matches_pylatexenc(latex):
+    expected_nodes = parse_latex_preamble(latex, registry.BODY_MACROS)
+    assert _tokenizer_calls(latex) == _pylatexenc_calls(expected_nodes)
+
+    expected = traverse_nodes(expected_nodes)
+    result = traverse_macro_calls(iter_macro_calls(latex, registry.MACRO_RULES, registry.BODY_MACROS))
+    assert (result.errors, result.warnings) == (expected.errors, expected.warnings)
+
+
+def test_tokenizer_falls_back_to_pylatexenc():
+    latex = _TRICKY.replace(r"\setlength\parindent  {1.25cm}", r"\setlength\parindent{1.25cm")
+
+    with pytest.raises(UnsupportedTeX):
+        _tokenizer_calls(latex)
+    expected = traverse_nodes(parse_latex_preamble(latex, registry.BODY_MACROS))
+    result = validate_latex(latex.encode())
+    assert (result.errors, result.warnings) == (expected.errors, expected.warnings)
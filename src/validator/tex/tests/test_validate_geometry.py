@@ -1,8 +1,17 @@
+import io
+from pathlib import Path
+
 from src.validator.result import ValidationResult, ErrCause
 from src.validator.tex.tests.mock import MockLatexMacroNode
 from src.validator.tex.validate_font_style import validate_parindent
+from src.validator.tex import registry
+from src.validator.tex.parser import load_latex, parse_latex_preamble, parse_latex_structure
+from src.validator.tex.registry import macro_rule
+from src.validator.tex.traverse_nodes import traverse_nodes, validate_latex
 from src.validator.tex.validate_geometry import validate_geometry
 
+_LATEX_TEST = Path(__file__).parents[4] / "latex_test"
+
 
 def test_geometry_valid():
     node = MockLatexMacroNode('geometry', ['left=30mm,right=10mm,top=20mm,bottom=20mm'])
@@ -27,4 +36,62 @@ def test_parindent_invalid():
     node = MockLatexMacroNode('setlength', ['\\parindent', '10mm'])
     result = ValidationResult.empty()
     validate_parindent(node, result)
-    assert ErrCause.INVALID_PARAGRAPH_INDENT in result.errors
\ No newline at end of file
+    assert ErrCause.INVALID_PARAGRAPH_INDENT in result.errors
+# Тесты для validate_latex
+def test_validate_latex_from_bytes():
+    source = rb"\documentclass[14pt]{article}\geometry{left=30mm,right=10mm,top=20mm,bottom=20mm}"
+    for data in (source, memoryview(source), io.BytesIO(source)):
+        result = validate_latex(data)
+        assert not result.has_err(ErrCause.INVALID_PAGE_FIELDS)
+        assert not result.has_err(ErrCause.INVALID_FONT_SIZE)
+
+def test_traversal_dispatches_by_macro_name(monkeypatch):
+    seen = []
+    monkeypatch.setattr(registry, "MACRO_RULES", {})
+    macro_rule("geometry", "setstretch")(lambda node, r: seen.append(node.macroname))
+
+    result = traverse_nodes(parse_latex_structure(
+        r"\textbf{a}\cite{b}\geometry{left=30mm}{\setstretch{1.5}\ref{c}}"))
+
+    assert seen == ["geometry", "setstretch"]
+    assert result.errors == ValidationResult.latex().errors
+
+def test_preamble_mode_matches_full_parse():
+    for path in sorted(_LATEX_TEST.glob("*.tex")):
+        latex = load_latex(path)
+        expected = traverse_nodes(parse_latex_structure(latex))
+        result = traverse_nodes(parse_latex_preamble(latex, registry.BODY_MACROS))
+        assert (result.errors, result.warnings) == (expected.errors, expected.warnings)
+
+    latex = "\n".join([
+        r"\documentclass[14pt]{article}",
+        r"% \begin{document}",
+        r"\geometry{left=30mm,right=10mm,top=20mm,bottom=20mm}",
+        r"\begin{document}",
+        r"\onehalfspacing",
+        r"% \textcolor{red}{old}",
+        r"Text \textcolor{blue}{\textbf{new}} and 100\% \\color",
+        r"\end{document}",
+    ])
+    nodes = parse_latex_preamble(latex, registry.BODY_MACROS)
+    assert [node.macroname for node in nodes[-2:]] == ["onehalfspacing", "textcolor"]
+    result = traverse_nodes(nodes)
+    assert result.errors[ErrCause.INVALID_FONT_COLOR] == "использован {blue} цвет для текста"
+    expected = traverse_nodes(parse_latex_structure(latex))
+    assert (result.errors, result.warnings) == (expected.errors, expected.warnings)
+    assert ErrCause.INVALID_LINE_SPACING not in result.warnings
+
+
+def test_body_scan_reads_tokens_like_tex():
+    body = {
+        r"Line\\\color{red} text": True,
+        r"Line\\% \color{red}": False,
+        r"Code \verb|\color{red}| text": False,
+        "\\begin{verbatim}\n\\color{red}\n\\end{verbatim}": False,
+    }
+    for text, colored in body.items():
+        latex = "\n".join([r"\documentclass[14pt]{article}", r"\begin{document}", text, r"\end{document}"])
+        result = traverse_nodes(parse_latex_preamble(latex, registry.BODY_MACROS))
+        expected = traverse_nodes(parse_latex_structure(latex))
+        assert (result.errors, result.warnings) == (expected.errors, expected.warnings)
+        assert (ErrCause.INVALID_FONT_COLOR in result.errors) == colored
@@ -0,0 +1,200 @@
+import re
+from typing import Container, Iterator, NamedTuple
+
+from pylatexenc.macrospec import MacroStandardArgsParser
+
+from src.validator.tex.parser import LATEX_CONTEXT
+
+# Макрос (имя из букв или один символ) или начало комментария
+_TOKEN = re.compile(r"\\(?:([A-Za-z@]+)|(.))|%", re.S)
+# Внутри аргумента важны ещё фигурные скобки и закрывающая квадратная
+_ARG_TOKEN = re.compile(r"\\(?:([A-Za-z@]+)|.)|%|[{}\]]", re.S)
+_NAME = re.compile(r"[A-Za-z@]+")
+# Пробелы после имени макроса, как macro_post_space в pylatexenc: не больше одного перевода строки
+_POST_SPACE = re.compile(r"[ \t]*(?:\n[ \t]*)?")
+_SPACE = re.compile(r"\s*")
+
+
+class UnsupportedTeX(ValueError):
+    """Конструкция, которую токенизатор не разбирает; такой документ разбирается pylatexenc."""
+
+
+class RawArg(str):
+    """Аргумент макроса как в исходном тексте, со скобками; latex_verbatim() - как у узлов pylatexenc."""
+
+    def latex_verbatim(self) -> str:
+        return str(self)
+
+
+class MacroCall(NamedTuple):
+    """
+    Вызов макроса с аргументами в том же виде, что у LatexMacroNode: nodeoptarg - первый
+    необязательный аргумент, nodeargs - остальные (см. ParsedMacroArgs.legacy_nodeoptarg_nodeargs).
+    """
+    macroname: str
+    nodeargs: list[RawArg | None]
+    nodeoptarg: RawArg | None
+    pos: int
+
+
+def _argspec(spec) -> str:
+    if spec is None:
+        return ""
+    if type(spec.args_parser) is not MacroStandardArgsParser:
+        raise UnsupportedTeX(f"нестандартные аргументы: {spec}")
+    return spec.args_parser.argspec
+
+
+def _end_of_comment(latex: str, pos: int) -> int:
+    end = latex.find("\n", pos)
+    return len(latex) if end < 0 else end + 1
+
+
+def _skip_space(latex: str, pos: int) -> int:
+    """Пробелы и комментарии перед аргументом; пустая строка (конец абзаца) не пропускается."""
+    while True:
+        space = _SPACE.match(latex, pos)
+        if space.group().count("\n") > 1:
+            raise UnsupportedTeX(f"пустая строка перед аргументом в позиции {pos}")
+        pos = space.end()
+        if not latex.startswith("%", pos):
+            return pos
+        pos = _end_of_comment(latex, pos)
+
+
+def _skip_verb(latex: str, pos: int) -> int:
+    """\\verb<c>...<c> (и \\verb*): pos - сразу после имени макроса."""
+    if latex.startswith("*", pos):
+        pos += 1
+    if pos >= len(latex) or latex[pos].isalpha() or latex[pos].isspace():
+        raise UnsupportedTeX(f"некорректный \\verb в позиции {pos}")
+    end = latex.find(latex[pos], pos + 1)
+    if end < 0 or "\n" in latex[pos:end]:
+        raise UnsupportedTeX(f"незакрытый \\verb в позиции {pos}")
+    return end + 1
+
+
+def _match(latex: str, pos: int, close: str) -> int:
+    """
+    Конец аргумента, начинающегося в pos с { или [. Учитываются вложенные {}, экранированные
+    скобки (\\{, \\}), комментарии и \\verb; квадратные скобки, как в pylatexenc, не вкладываются.
+    """
+    depth = 0
+    pos += 1
+    while True:
+        token = _ARG_TOKEN.search(latex, pos)
+        if token is None:
+            raise UnsupportedTeX("незакрытый аргумент")
+        pos = token.end()
+        text = token.group()
+        if token.group(1) == "verb":
+            pos = _skip_verb(latex, pos)
+        elif text == "%":
+            pos = _end_of_comment(latex, pos)
+        elif text == "{":
+            depth += 1
+        elif text == "}":
+            if depth == 0:
+                if close == "}":
+                    return pos
+                raise UnsupportedTeX(f"лишняя }} в необязательном аргументе в позиции {pos}")
+            depth -= 1
+        elif text == "]" and depth == 0 and close == "]":
+            return pos
+
+
+def _read_args(latex: str, pos: int, argspec: str) -> tuple[list[RawArg | None], int]:
+    """Аргументы по спецификации pylatexenc: * - звёздочка, [ - необязательный, { - обязательный."""
+    args: list[RawArg | None] = []
+    for kind in argspec:
+        start = _skip_space(latex, pos)
+        char = latex[start:start + 1]
+        if kind in "*[":
+            if char != kind:
+                args.append(None)
+                continue
+            pos = start + 1 if kind == "*" else _match(latex, start, "]")
+        elif char == "{":
+            pos = _match(latex, start, "}")
+        elif char == "\\":
+            name = _NAME.match(latex, start + 1)
+            pos = _POST_SPACE.match(latex, name.end()).end() if name else start + 2
+        elif char == "}":
+            # Как pylatexenc: аргумент пустой, скобка остаётся за группой
+            pos = start
+        elif char and char != "$":
+            pos = start + 1
+        else:
+            raise UnsupportedTeX(f"нет обязательного аргумента в позиции {start}")
+        args.append(RawArg(latex[start:pos]))
+    return args, pos
+
+
+def _call(name: str, argspec: str, args: list[RawArg | None], pos: int) -> MacroCall:
+    stars = len(argspec) - len(argspec.lstrip("*"))
+    rest = argspec[stars:]
+    if rest[:1] == "[" and set(rest[1:]) <= {"{"}:
+        return MacroCall(name, args[stars + 1:], args[stars], pos)
+    return MacroCall(name, args, None, pos)
+
+
+def _environment(latex: str, pos: int) -> tuple[str, int]:
+    """Имя окружения после \\begin или \\end и позиция за ним."""
+    start = _skip_space(latex, pos)
+    end = latex.find("}", start)
+    if not latex.startswith("{", start) or end < 0 or "{" in latex[start + 1:end]:
+        raise UnsupportedTeX(f"некорректное имя окружения в позиции {start}")
+    return latex[start + 1:end], end + 1
+
+
+def _skip_verbatim(latex: str, pos: int, name: str) -> int:
+    end = re.compile(r"\\end\s*\{" + re.escape(name) + r"\}").search(latex, pos)
+    if end is None:
+        raise UnsupportedTeX(f"незакрытое окружение {name}")
+    return end.end()
+
+
+def iter_macro_calls(latex: str, macronames: Container[str], body_macronames: Container[str]) -> Iterator[MacroCall]:
+    """
+    Потоковый разбор TeX без построения дерева: выдаёт только вызовы макросов macronames
+    из преамбулы и body_macronames из тела документа, с аргументами в исходном виде.
+
+    Преамбула разбирается как pylatexenc: аргументы любого макроса читаются по спецификации
+    из LATEX_CONTEXT, и макросы внутри них не выдаются. В теле, как в parse_latex_preamble,
+    аргументы читаются только у искомых макросов, а просмотр продолжается внутри них.
+    Комментарии, \\verb и verbatim-окружения пропускаются. На конструкциях, которые
+    токенизатор не разбирает, бросается UnsupportedTeX.
+    """
+    pos = 0
+    body = False
+    while True:
+        token = _TOKEN.search(latex, pos)
+        if token is None:
+            return
+        if token.group() == "%":
+            pos = _end_of_comment(latex, token.end())
+            continue
+        name = token.group(1) or token.group(2)
+        pos = token.end()
+        if name == "verb":
+            pos = _skip_verb(latex, pos)
+        elif name == "begin":
+            environment, pos = _environment(latex, pos)
+            if environment == "document":
+                body = True
+                continue
+            spec = LATEX_CONTEXT.get_environment_spec(environment)
+            if spec is not None and type(spec.args_parser) is not MacroStandardArgsParser:
+                pos = _skip_verbatim(latex, pos, environment)
+            elif not body:
+                _, pos = _read_args(latex, pos, _argspec(spec))
+        elif body:
+            if name in body_macronames:
+                argspec = _argspec(LATEX_CONTEXT.get_macro_spec(name))
+                args, _ = _read_args(latex, pos, argspec)
+                yield _call(name, argspec, args, token.start())
+        else:
+            argspec = _argspec(LATEX_CONTEXT.get_macro_spec(name))
+            args, pos = _read_args(latex, pos, argspec)
+            if name in macronames:
+                yield _call(name, argspec, args, token.start())
@@ -1,11 +1,39 @@
+from typing import Iterable
+
 from pylatexenc.latexwalker import LatexWalker, LatexMacroNode, LatexGroupNode, LatexEnvironmentNode, LatexCharsNode
 
 from src.validator.result import ValidationResult
 from src.validator.tex.validate_font_style import *
-from src.validator.tex.parser import extract_mandatory_args, extract_optional_arg
+from src.validator.source import Source
+from src.validator.tex import registry
+from src.validator.tex.parser import extract_mandatory_args, extract_optional_arg, load_latex, parse_latex_preamble, \
+    parse_latex_structure
+from src.validator.tex.registry import rules_for
+from src.validator.tex.tokenizer import MacroCall, UnsupportedTeX, iter_macro_calls
+# Импорт модулей с проверками регистрирует их в MACRO_RULES
 from src.validator.tex.validate_geometry import validate_geometry
 
 
+def validate_latex(source: Source) -> ValidationResult:
+    """
+    Проверяет документ LaTeX по пути или из памяти. Вызовы нужных макросов выдаёт потоковый
+    токенизатор (tokenizer.iter_macro_calls); если он встретил то, что не разбирает,
+    документ разбирается pylatexenc: полностью только преамбула, из тела берутся макросы
+    проверок, зарегистрированных с body=True.
+    """
+    latex = load_latex(source)
+    try:
+        return traverse_macro_calls(iter_macro_calls(latex, registry.MACRO_RULES, registry.BODY_MACROS))
+    except UnsupportedTeX:
+        return traverse_nodes(parse_latex_preamble(latex, registry.BODY_MACROS))
+
+def traverse_macro_calls(calls: Iterable[MacroCall]) -> ValidationResult:
+    result = ValidationResult.latex()
+    for call in calls:
+        for rule in rules_for(call.macroname):
+            rule(call, result)
+    return result
+
 def traverse_nodes(nodelist: list) -> ValidationResult:
     result = ValidationResult.latex()
     __traverse_nodes(nodelist, result)
@@ -14,13 +42,9 @@ def traverse_nodes(nodelist: list) -> ValidationResult:
 def __traverse_nodes(nodelist, r: ValidationResult):
     for node in nodelist:
         if isinstance(node, LatexMacroNode):
-            # запускаем все необходимые проверки
-            validate_font_usage(node, r)
-            validate_font_color(node, r)
-            validate_geometry(node, r)
-            validate_parindent(node, r)
-            validate_font_sz(node, r)
-            validate_line_spacing(node, r)
+            # запускаем только проверки, зарегистрированные для этого макроса
+            for rule in rules_for(node.macroname):
+                rule(node, r)
 
         # Рекурсивный обход для вложенных групп:
         if hasattr(node, 'nodelist') and node.nodelist:
@@ -1,11 +1,13 @@
 from pylatexenc.latexwalker import LatexMacroNode
 
 from src.validator.result import ValidationResult, ErrCause
+from src.validator.tex.registry import macro_rule
 from src.validator.tex.parser import extract_mandatory_args, extract_optional_arg
 from src.validator.util import convert_to_mm
 
 _WHITELIST_PACKAGES = ['{times}', '{mathptmx}', '{tempora}']
 
+@macro_rule("usepackage", "setmainfont")
 def validate_font_usage(node, r: ValidationResult):
     """
     Проверяем наличие указания на использование Times New Roman:
@@ -24,12 +26,14 @@ def validate_font_usage(node, r: ValidationResult):
             else:
                 r.add_err(ErrCause.INVALID_FONT, f"{args[0]} установлен в качестве шрифта по умолчанию")
 
+@macro_rule("color", "textcolor", body=True)
 def validate_font_color(node, r: ValidationResult):
     if node.macroname in ['color', 'textcolor']:
         args = extract_mandatory_args(node)
         if args and args[0] != 'black':
             r.add_err(ErrCause.INVALID_FONT_COLOR, f"использован {args[0]} цвет для текста")
 
+@macro_rule("setlength", body=True)
 def validate_parindent(node, r: ValidationResult):
     if node.macroname == "setlength":
         args = extract_mandatory_args(node)
@@ -39,12 +43,14 @@ def validate_parindent(node, r: ValidationResult):
             else:
                 r.add_err(ErrCause.INVALID_PARAGRAPH_INDENT, f"установлен абзацный отступ {args[1]}")
 
+@macro_rule("documentclass")
 def validate_font_sz(node, r: ValidationResult):
     if node.macroname == "documentclass":
         opt = extract_optional_arg(node)
         if opt and (('14pt' in opt) or ('12pt' in opt)):
             r.del_err(ErrCause.INVALID_FONT_SIZE)
 
+@macro_rule("onehalfspacing", "setstretch", body=True)
 def validate_line_spacing(node, r: ValidationResult):
     if node.macroname == "onehalfspacing":
         r.del_warn(ErrCause.INVALID_LINE_SPACING)
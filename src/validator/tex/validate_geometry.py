@@ -1,6 +1,7 @@
 import re
 
 from src.validator.result import ValidationResult, ErrCause
+from src.validator.tex.registry import macro_rule
 from src.validator.tex.parser import extract_mandatory_args, extract_optional_arg
 from src.validator.util import convert_to_mm
 
@@ -43,6 +44,7 @@ def __validate_geometry_args(args, r: ValidationResult):
     else:
         r.add_err(ErrCause.INVALID_PAGE_FIELDS, err)
 
+@macro_rule("usepackage", "geometry")
 def validate_geometry(node, r: ValidationResult):
     if node.macroname == "usepackage":
         args = extract_mandatory_args(node)